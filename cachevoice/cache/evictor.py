@@ -2,15 +2,29 @@
 from __future__ import annotations
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
+import anyio
+
 if TYPE_CHECKING:
     from .hot import HotCache
 
 from .metadata import CacheMetadataDB
+from .store import CONVERTED_FORMATS, converted_path
 
 logger = logging.getLogger("cachevoice.evictor")
 
+UNLINK_WORKERS = 8
+
+
+def _safe_unlink(path: str):
+    # No exists() pre-check: unlink reports a missing file itself.
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
 
 class CacheEvictor:
     def __init__(self, db: CacheMetadataDB, max_entries: int = 50000,
@@ -23,18 +37,43 @@ class CacheEvictor:
         self._hot_cache = hot_cache
 
     def run(self) -> int:
+        candidates, paths = self._delete_candidates()
+        self._remove_from_hot(candidates)
+        self._unlink_all(paths)
+        return self._log_removed(len(candidates))
+
+    async def run_async(self) -> int:
+        """run() with the DB scan and file deletes in worker threads.
+
+        Hot cache updates stay on the calling event loop, since request
+        handlers read the hot cache there without locking.
+        """
+        candidates, paths = await anyio.to_thread.run_sync(self._delete_candidates)
+        self._remove_from_hot(candidates)
+        await anyio.to_thread.run_sync(self._unlink_all, paths)
+        return self._log_removed(len(candidates))
+
+    def _delete_candidates(self) -> tuple[list[dict[str, object]], list[str]]:
         candidates = self._db.get_eviction_candidates(self._max_entries, self._min_age_days)
-        removed = 0
-        for entry in candidates:
-            audio_path = self._db.delete_entry(entry["id"])  # pyright: ignore[reportArgumentType]
-            if audio_path and os.path.exists(audio_path):
-                try:
-                    os.remove(audio_path)
-                except OSError:
-                    pass
-            if self._hot_cache:
+        paths = self._db.delete_entries([int(e["id"]) for e in candidates])  # pyright: ignore[reportArgumentType]
+        # Converted renditions go with their source; most won't exist, which unlink tolerates
+        paths += [converted_path(p, fmt) for p in paths for fmt in CONVERTED_FORMATS]
+        return candidates, paths
+
+    def _remove_from_hot(self, candidates: list[dict[str, object]]):
+        if self._hot_cache:
+            for entry in candidates:
                 self._hot_cache.remove(str(entry["text_normalized"]), str(entry["voice_id"]))
-            removed += 1
+
+    @staticmethod
+    def _unlink_all(paths: list[str]):
+        if paths:
+            # unlink is latency-bound and independent per file, so fan it out
+            with ThreadPoolExecutor(max_workers=min(UNLINK_WORKERS, len(paths))) as ex:
+                list(ex.map(_safe_unlink, paths))
+
+    @staticmethod
+    def _log_removed(removed: int) -> int:
         if removed:
             logger.info("Evicted %d cache entries", removed)
         return removed
@@ -1,8 +1,10 @@
 """In-memory hot cache (dict) — loaded from SQLite at startup."""
 from __future__ import annotations
+import math
 import random
-from collections import defaultdict
-from typing import Optional, Callable, Any
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Optional
+import numpy as np
 from rapidfuzz import process, fuzz
 
 SCORERS: dict[str, Callable[..., Any]] = {
@@ -13,22 +15,66 @@ SCORERS: dict[str, Callable[..., Any]] = {
 }
 
 
+def _sort_tokens(text: str) -> str:
+    """Token-sorted form: fuzz.ratio on these equals token_sort_ratio on the originals."""
+    return " ".join(sorted(text.split()))
+
+
+def _ratio_length_bounds(length: int, threshold: float) -> tuple[float, float]:
+    """Candidate lengths that can still reach `threshold` under fuzz.ratio.
+
+    ratio <= 200 * min(a, b) / (a + b), so a candidate of length m can only
+    score >= t against a query of length n when n*t/(200-t) <= m <= n*(200-t)/t.
+    """
+    if threshold <= 0:
+        return 0, math.inf
+    lo = math.ceil(length * threshold / (200 - threshold) - 1e-9)
+    hi = math.floor(length * (200 - threshold) / threshold + 1e-9)
+    return lo, hi
+
+
+class FuzzyChoices(NamedTuple):
+    """Per-voice candidate snapshot for process.cdist.
+
+    Rebuilt rather than mutated when the bucket changes, so a worker thread
+    can keep scoring against it while the event loop updates the cache.
+    Holds each key's first audio path rather than the cache's own path dict,
+    which HotCache.add keeps growing in place.
+    """
+    keys: list[str]
+    paths: list[str]
+    lengths: list[int]
+    texts: np.ndarray
+    sorted_texts: np.ndarray
+
+
 class HotCache:
     def __init__(self, variety_depth: int = 1):
-        # Voice bucketing: voice_id -> normalized_text -> [audio_paths]
-        self._buckets: dict[str, dict[str, list[str]]] = defaultdict(lambda: dict[str, list[str]]())
+        # Voice bucketing: voice_id -> normalized_text -> audio paths, stored as an
+        # insertion-ordered dict so membership checks are O(1)
+        self._buckets: dict[str, dict[str, dict[str, None]]] = {}
+        # voice_id -> len(sorted) -> normalized_text -> token-sorted text, kept for
+        # token_sort_ratio; bucketing by length lets fuzzy_lookup skip candidates
+        # that cannot reach the threshold.
+        self._sorted_tokens: dict[str, dict[int, dict[str, str]]] = {}
+        # voice_id -> FuzzyChoices, dropped whenever that voice's bucket changes
+        self._choices: dict[str, FuzzyChoices] = {}
         self._variety_depth = max(1, variety_depth)
 
-    def load_entries(self, entries: list[dict[str, str]]):
+    def load_entries(self, entries: Iterable[Mapping[str, Any]]) -> int:
+        """Index entries (e.g. CacheMetadataDB.iter_all_entries); returns how many were read."""
+        count = 0
         for e in entries:
+            count += 1
             vid = e['voice_id']
             norm = e['text_normalized']
             path = e['audio_path']
-            bucket = self._buckets[vid]
+            bucket = self._buckets.setdefault(vid, {})
             if norm not in bucket:
-                bucket[norm] = []
-            if path not in bucket[norm]:
-                bucket[norm].append(path)
+                bucket[norm] = {}
+                self._index_sorted(vid, norm)
+            bucket[norm].setdefault(path, None)
+        return count
 
     def exact_lookup(self, normalized_text: str, voice_id: str) -> Optional[str]:
         bucket = self._buckets.get(voice_id)
@@ -38,52 +84,154 @@ class HotCache:
         if not paths:
             return None
         if len(paths) == 1:
-            return paths[0]
-        return random.choice(paths)
+            return next(iter(paths))
+        return random.choice(list(paths))
 
     def fuzzy_lookup(
         self, normalized_text: str, voice_id: str,
         threshold: int = 90, scorer: str = "token_sort_ratio",
     ) -> Optional[tuple[str, str, float]]:
-        bucket = self._buckets.get(voice_id)
-        if not bucket:
-            return None
-        candidates = list(bucket.keys())
-        if not candidates:
+        choices = self.fuzzy_choices(voice_id)
+        if choices is None:
             return None
         scorer_fn = SCORERS.get(scorer, fuzz.token_sort_ratio)
+        if scorer_fn is fuzz.token_sort_ratio:
+            query = _sort_tokens(normalized_text)
+            lo, hi = _ratio_length_bounds(len(query), threshold)
+            start = bisect_left(choices.lengths, lo)
+            stop = bisect_right(choices.lengths, hi)
+            if start >= stop:
+                return None
+            # Candidates are pre-sorted and ordered by length, so the reachable
+            # window is a contiguous slice of the snapshot.
+            match = process.extractOne(
+                query, choices.sorted_texts[start:stop],
+                scorer=fuzz.ratio, score_cutoff=threshold,
+            )
+            if match:
+                _, score, index = match
+                index += start
+                return (choices.keys[index], choices.paths[index], score)
+            return None
         match = process.extractOne(
-            normalized_text, candidates,
+            normalized_text, choices.texts,
             scorer=scorer_fn, score_cutoff=threshold,
         )
         if match:
-            matched_text, score, _ = match
-            paths = bucket[matched_text]
-            return (matched_text, paths[0], score)
+            _, score, index = match
+            return (choices.keys[index], choices.paths[index], score)
         return None
 
+    def fuzzy_choices(self, voice_id: str) -> Optional[FuzzyChoices]:
+        """Cached candidate snapshot for a voice, ordered by token-sorted length."""
+        choices = self._choices.get(voice_id)
+        if choices is not None:
+            return choices
+        bucket = self._buckets.get(voice_id)
+        if not bucket:
+            return None
+        keys: list[str] = []
+        sorted_texts: list[str] = []
+        lengths: list[int] = []
+        for length, texts in sorted(self._sorted_tokens.get(voice_id, {}).items()):
+            keys.extend(texts.keys())
+            sorted_texts.extend(texts.values())
+            lengths.extend([length] * len(texts))
+        choices = FuzzyChoices(
+            keys=keys,
+            paths=[next(iter(bucket[k])) for k in keys],
+            lengths=lengths,
+            texts=np.array(keys, dtype=object),
+            sorted_texts=np.array(sorted_texts, dtype=object),
+        )
+        self._choices[voice_id] = choices
+        return choices
+
+    def fuzzy_lookup_many(
+        self, normalized_texts: list[str], voice_id: str,
+        threshold: int = 90, scorer: str = "token_sort_ratio",
+    ) -> list[Optional[tuple[str, str, float]]]:
+        """Batched fuzzy_lookup: scores every query in a single process.cdist call."""
+        return score_choices(self.fuzzy_choices(voice_id), normalized_texts, threshold, scorer)
+
     def get_paths(self, normalized_text: str, voice_id: str) -> list[str]:
         bucket = self._buckets.get(voice_id)
         if not bucket:
             return []
-        return list(bucket.get(normalized_text, []))
+        return list(bucket.get(normalized_text, ()))
 
     def add(self, normalized_text: str, voice_id: str, audio_path: str):
-        bucket = self._buckets[voice_id]
+        bucket = self._buckets.setdefault(voice_id, {})
         if normalized_text not in bucket:
-            bucket[normalized_text] = []
+            bucket[normalized_text] = {}
+            self._index_sorted(voice_id, normalized_text)
         paths = bucket[normalized_text]
-        if audio_path not in paths and len(paths) < self._variety_depth:
-            paths.append(audio_path)
+        if len(paths) < self._variety_depth:
+            paths.setdefault(audio_path, None)
 
     def remove(self, normalized_text: str, voice_id: str):
         bucket = self._buckets.get(voice_id)
         if bucket:
-            bucket.pop(normalized_text, None)
+            if bucket.pop(normalized_text, None) is not None:
+                self._unindex_sorted(voice_id, normalized_text)
 
     def clear(self):
         self._buckets.clear()
+        self._sorted_tokens.clear()
+        self._choices.clear()
+
+    def _index_sorted(self, voice_id: str, normalized_text: str):
+        self._choices.pop(voice_id, None)
+        sorted_text = _sort_tokens(normalized_text)
+        by_len = self._sorted_tokens.setdefault(voice_id, {})
+        by_len.setdefault(len(sorted_text), {})[normalized_text] = sorted_text
+
+    def _unindex_sorted(self, voice_id: str, normalized_text: str):
+        self._choices.pop(voice_id, None)
+        by_len = self._sorted_tokens.get(voice_id)
+        if not by_len:
+            return
+        length = len(_sort_tokens(normalized_text))
+        texts = by_len.get(length)
+        if texts is not None:
+            texts.pop(normalized_text, None)
+            if not texts:
+                del by_len[length]
 
     @property
     def size(self) -> int:
         return sum(len(b) for b in self._buckets.values())
+
+
+def score_choices(
+    choices: Optional[FuzzyChoices], normalized_texts: list[str],
+    threshold: int = 90, scorer: str = "token_sort_ratio",
+) -> list[Optional[tuple[str, str, float]]]:
+    """Score queries against a FuzzyChoices snapshot.
+
+    Only touches the snapshot, and process.cdist with workers=-1 releases
+    the GIL, so this is safe to run in a worker thread.
+    """
+    if choices is None or not choices.keys or not normalized_texts:
+        return [None] * len(normalized_texts)
+    scorer_fn = SCORERS.get(scorer, fuzz.token_sort_ratio)
+    if scorer_fn is fuzz.token_sort_ratio:
+        queries = [_sort_tokens(t) for t in normalized_texts]
+        targets = choices.sorted_texts
+        scorer_fn = fuzz.ratio
+    else:
+        queries = list(normalized_texts)
+        targets = choices.texts
+    scores = process.cdist(
+        queries, targets,
+        scorer=scorer_fn, score_cutoff=threshold,
+        workers=-1, dtype=np.float64,
+    )
+    results: list[Optional[tuple[str, str, float]]] = []
+    for row, col in enumerate(scores.argmax(axis=1)):
+        score = float(scores[row, col])
+        if score >= threshold:
+            results.append((choices.keys[col], choices.paths[col], score))
+        else:
+            results.append(None)
+    return results
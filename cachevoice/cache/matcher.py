@@ -1,8 +1,9 @@
 """FuzzyMatcher — rapidfuzz-based cache matching."""
 from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
+import anyio
 from .normalizer import normalize
-from .hot import HotCache
+from .hot import HotCache, score_choices
 
 if TYPE_CHECKING:
     from ..config import FuzzyConfig
@@ -17,18 +18,78 @@ class FuzzyMatcher:
         self._fuzzy_enabled = fuzzy_config.enabled
         self._threshold = fuzzy_config.threshold
         self._scorer = fuzzy_config.scorer
+        # Scores top out at 100, and a plain ratio of 100 means the strings are
+        # identical, which exact_lookup already ruled out. Token-sort / partial
+        # scorers can still reach 100 on non-identical text, so they keep fuzzy.
+        self._fuzzy_effective = self._fuzzy_enabled and (
+            self._threshold < 100 or (self._threshold == 100 and self._scorer != "ratio")
+        )
 
     def find(self, text: str, voice_id: str) -> Optional[dict[str, object]]:
-        normalized = normalize(text)
+        return self.find_normalized(normalize(text), voice_id)
+
+    def find_normalized(self, normalized: str, voice_id: str) -> Optional[dict[str, object]]:
+        """find() for a key that has already been through normalize()."""
         if not normalized:
             return None
         path = self._hot.exact_lookup(normalized, voice_id)
         if path:
             return {"audio_path": path, "match_type": "exact", "score": 100, "normalized": normalized}
-        if not self._fuzzy_enabled:
+        if not self._fuzzy_effective:
             return None
         result = self._hot.fuzzy_lookup(normalized, voice_id, self._threshold, self._scorer)
         if result:
             matched_text, path, score = result
             return {"audio_path": path, "match_type": "fuzzy", "score": score, "normalized": normalized, "matched": matched_text}
         return None
+
+    async def find_async(self, text: str, voice_id: str) -> Optional[dict[str, object]]:
+        """find() with fuzzy scoring run in a worker thread, off the event loop."""
+        return await self.find_normalized_async(normalize(text), voice_id)
+
+    async def find_normalized_async(self, normalized: str, voice_id: str) -> Optional[dict[str, object]]:
+        """find_async() for a key that has already been through normalize()."""
+        if not normalized:
+            return None
+        path = self._hot.exact_lookup(normalized, voice_id)
+        if path:
+            return {"audio_path": path, "match_type": "exact", "score": 100, "normalized": normalized}
+        if not self._fuzzy_effective:
+            return None
+        choices = self._hot.fuzzy_choices(voice_id)
+        if choices is None:
+            return None
+        matches = await anyio.to_thread.run_sync(
+            score_choices, choices, [normalized], self._threshold, self._scorer,
+        )
+        if matches[0]:
+            matched_text, path, score = matches[0]
+            return {"audio_path": path, "match_type": "fuzzy", "score": score, "normalized": normalized, "matched": matched_text}
+        return None
+
+    def find_many(self, texts: list[str], voice_id: str) -> list[Optional[dict[str, object]]]:
+        """Batched find(): exact hits per text, remaining misses fuzzy-scored together."""
+        return self.find_many_normalized([normalize(text) for text in texts], voice_id)
+
+    def find_many_normalized(self, normalized_texts: list[str], voice_id: str) -> list[Optional[dict[str, object]]]:
+        """find_many() for keys that have already been through normalize()."""
+        results: list[Optional[dict[str, object]]] = [None] * len(normalized_texts)
+        pending: list[tuple[int, str]] = []
+        for i, normalized in enumerate(normalized_texts):
+            if not normalized:
+                continue
+            path = self._hot.exact_lookup(normalized, voice_id)
+            if path:
+                results[i] = {"audio_path": path, "match_type": "exact", "score": 100, "normalized": normalized}
+            else:
+                pending.append((i, normalized))
+        if not self._fuzzy_effective or not pending:
+            return results
+        matches = self._hot.fuzzy_lookup_many(
+            [normalized for _, normalized in pending], voice_id, self._threshold, self._scorer,
+        )
+        for (i, normalized), match in zip(pending, matches):
+            if match:
+                matched_text, path, score = match
+                results[i] = {"audio_path": path, "match_type": "fuzzy", "score": score, "normalized": normalized, "matched": matched_text}
+        return results
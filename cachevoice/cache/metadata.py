@@ -2,23 +2,97 @@
 from __future__ import annotations
 import sqlite3
 import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Sequence
+
+import anyio
 
 CURRENT_SCHEMA_VERSION = 2
+HIT_FLUSH_BATCH_SIZE = 256
+# Stay under SQLITE_MAX_VARIABLE_NUMBER (999 on older builds) for IN (...) lists
+DELETE_BATCH_SIZE = 500
+ENTRY_FETCH_BATCH_SIZE = 1000
+# Page cache per connection, in KiB (negative PRAGMA cache_size form)
+PAGE_CACHE_KIB = 64000
+
+_HitKey = tuple[str, str, Optional[int]]
+
+_INSERT_ENTRY_SQL = """INSERT OR IGNORE INTO cache_entries (text_original, text_normalized, voice_id, model,
+                       audio_path, audio_format, file_size, is_filler, version_num)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# Insert, or count a hit on the row that won a concurrent insert of the same version.
+# A freshly inserted row still has hit_count 0, which tells the two cases apart.
+_UPSERT_ENTRY_SQL = """INSERT INTO cache_entries (text_original, text_normalized, voice_id, model,
+                       audio_path, audio_format, file_size, is_filler, version_num)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(text_normalized, voice_id, version_num) DO UPDATE
+                       SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
+                       RETURNING id, hit_count"""
 
 
 class CacheMetadataDB:
     def __init__(self, db_path: str):
         self._db_path = db_path
         self._miss_count = 0
+        # Hits queued by record_hit_async: key -> (count, last_hit_at)
+        self._pending_hits: dict[_HitKey, tuple[int, str]] = {}
+        self._pending_lock = threading.Lock()
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One long-lived connection shared across threads (record_hit_async runs
+        # in the default executor); every statement goes through self._lock.
+        self._lock = threading.Lock()
+        self._conn = self._connect()
         self._init_db()
+        # Read-only queries (stats, version counts, scans) use a second
+        # connection so WAL lets them run alongside a write on self._conn.
+        if db_path == ":memory:":
+            self._read_lock, self._read_conn = self._lock, self._conn
+        else:
+            self._read_lock = threading.Lock()
+            self._read_conn = self._connect()
+            self._read_conn.execute("PRAGMA query_only=ON")
 
-    def _init_db(self):
-        conn = sqlite3.connect(self._db_path)
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Truncate the -wal file back to this size after checkpoints
+        conn.execute("PRAGMA journal_size_limit=67108864")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=67108864")
+        conn.execute(f"PRAGMA cache_size=-{PAGE_CACHE_KIB}")
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        self.flush_hits()
+        if self._read_conn is not self._conn:
+            with self._read_lock:
+                self._read_conn.close()
+        with self._lock:
+            self._conn.close()
+
+    def _init_db(self):
+        with self._transaction() as conn:
+            self._init_schema(conn)
 
+    def _init_schema(self, conn: sqlite3.Connection):
         conn.execute("""
             CREATE TABLE IF NOT EXISTS schema_version (
                 version INTEGER NOT NULL
@@ -45,8 +119,8 @@ class CacheMetadataDB:
                 conn.execute("UPDATE schema_version SET version = ?",
                              (CURRENT_SCHEMA_VERSION,))
 
-        conn.commit()
-        conn.close()
+        # Indexes are IF NOT EXISTS so ones added later also reach existing DBs.
+        self._create_indexes(conn)
 
     def _create_tables_v2(self, conn: sqlite3.Connection):
         conn.execute("""
@@ -67,11 +141,16 @@ class CacheMetadataDB:
                 last_hit_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+
+    def _create_indexes(self, conn: sqlite3.Connection):
         conn.execute("CREATE INDEX IF NOT EXISTS idx_voice_model ON cache_entries(voice_id, model)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_last_hit ON cache_entries(last_hit_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_normalized ON cache_entries(text_normalized)")
         conn.execute("""CREATE UNIQUE INDEX IF NOT EXISTS idx_normalized_voice_version
                         ON cache_entries(text_normalized, voice_id, version_num)""")
+        # Stale never-hit entries, walked in created_at order by get_eviction_candidates
+        conn.execute("""CREATE INDEX IF NOT EXISTS idx_evictable_created
+                        ON cache_entries(created_at) WHERE is_filler = 0 AND hit_count = 0""")
 
     def _migrate_to_v2(self, conn: sqlite3.Connection):
         """Migrate v1 schema to v2: add version_num, deduplicate, add unique constraint."""
@@ -93,70 +172,142 @@ class CacheMetadataDB:
             )
         """)
 
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_voice_model ON cache_entries(voice_id, model)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_last_hit ON cache_entries(last_hit_at)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_normalized ON cache_entries(text_normalized)")
-
-        conn.execute("""CREATE UNIQUE INDEX IF NOT EXISTS idx_normalized_voice_version
-                        ON cache_entries(text_normalized, voice_id, version_num)""")
-
-    def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def add_entry(self, text_original: str, text_normalized: str, voice_id: str,
                   audio_path: str, model: str = "", audio_format: str = "mp3",
                   file_size: int = 0, is_filler: bool = False,
                   version_num: int = 1) -> int:
-        conn = self._get_conn()
-        try:
-            cursor = conn.execute(
-                """INSERT OR IGNORE INTO cache_entries (text_original, text_normalized, voice_id, model,
-                   audio_path, audio_format, file_size, is_filler, version_num)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        with self._lock:
+            cursor = self._conn.execute(
+                _INSERT_ENTRY_SQL,
                 (text_original, text_normalized, voice_id, model, audio_path,
                  audio_format, file_size, int(is_filler), version_num)
             )
-            conn.commit()
 
             if cursor.rowcount == 1:
                 entry_id = cursor.lastrowid
             else:
-                row = conn.execute(
+                row = self._conn.execute(
                     """SELECT id FROM cache_entries
                        WHERE text_normalized = ? AND voice_id = ? AND version_num = ?""",
                     (text_normalized, voice_id, version_num)
                 ).fetchone()
                 entry_id = row["id"] if row else None
-        finally:
-            conn.close()
 
         if entry_id is None:
             raise RuntimeError("Failed to insert cache entry: missing entry id after insert")
         return entry_id
 
+    async def add_entry_async(self, text_original: str, text_normalized: str, voice_id: str,
+                              audio_path: str, model: str = "", audio_format: str = "mp3",
+                              file_size: int = 0, is_filler: bool = False,
+                              version_num: int = 1) -> int:
+        """add_entry() in a worker thread, so waiting on the DB lock never blocks the event loop."""
+        return await anyio.to_thread.run_sync(functools.partial(
+            self.add_entry, text_original, text_normalized, voice_id, audio_path,
+            model=model, audio_format=audio_format, file_size=file_size,
+            is_filler=is_filler, version_num=version_num,
+        ))
+
+    def add_or_hit_entry(self, text_original: str, text_normalized: str, voice_id: str,
+                         audio_path: str, model: str = "", audio_format: str = "mp3",
+                         file_size: int = 0, is_filler: bool = False,
+                         version_num: int = 1) -> tuple[int, bool]:
+        """add_entry(), but an existing version counts as a hit instead of being ignored.
+
+        One statement either way; returns (entry_id, inserted).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                _UPSERT_ENTRY_SQL,
+                (text_original, text_normalized, voice_id, model, audio_path,
+                 audio_format, file_size, int(is_filler), version_num)
+            ).fetchone()
+        return row["id"], row["hit_count"] == 0
+
+    async def add_or_hit_entry_async(self, text_original: str, text_normalized: str, voice_id: str,
+                                     audio_path: str, model: str = "", audio_format: str = "mp3",
+                                     file_size: int = 0, is_filler: bool = False,
+                                     version_num: int = 1) -> tuple[int, bool]:
+        """add_or_hit_entry() in a worker thread."""
+        return await anyio.to_thread.run_sync(functools.partial(
+            self.add_or_hit_entry, text_original, text_normalized, voice_id, audio_path,
+            model=model, audio_format=audio_format, file_size=file_size,
+            is_filler=is_filler, version_num=version_num,
+        ))
+
+    def add_entries_bulk(self, entries: Iterable[dict[str, object]]) -> int:
+        """Insert many entries (add_entry keyword dicts) in one transaction.
+
+        Duplicates of an existing (text_normalized, voice_id, version_num) are
+        skipped as in add_entry. Returns the number of rows inserted.
+        """
+        rows = [
+            (e["text_original"], e["text_normalized"], e["voice_id"], e.get("model", ""),
+             e["audio_path"], e.get("audio_format", "mp3"), e.get("file_size", 0),
+             int(bool(e.get("is_filler", False))), e.get("version_num", 1))
+            for e in entries
+        ]
+        if not rows:
+            return 0
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(_INSERT_ENTRY_SQL, rows)
+            return conn.total_changes - before
+
     def record_hit(self, text_normalized: str, voice_id: str,
                    version_num: Optional[int] = None):
-        conn = self._get_conn()
-        if version_num is not None:
-            conn.execute(
-                """UPDATE cache_entries SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
-                   WHERE text_normalized = ? AND voice_id = ? AND version_num = ?""",
-                (text_normalized, voice_id, version_num)
-            )
-        else:
-            conn.execute(
-                """UPDATE cache_entries SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
-                   WHERE text_normalized = ? AND voice_id = ?""",
-                (text_normalized, voice_id)
-            )
-        conn.commit()
-        conn.close()
+        with self._lock:
+            if version_num is not None:
+                self._conn.execute(
+                    """UPDATE cache_entries SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
+                       WHERE text_normalized = ? AND voice_id = ? AND version_num = ?""",
+                    (text_normalized, voice_id, version_num)
+                )
+            else:
+                self._conn.execute(
+                    """UPDATE cache_entries SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
+                       WHERE text_normalized = ? AND voice_id = ?""",
+                    (text_normalized, voice_id)
+                )
 
     async def record_hit_async(self, text_normalized: str, voice_id: str,
                                version_num: Optional[int] = None):
-        await asyncio.to_thread(self.record_hit, text_normalized, voice_id, version_num)
+        """Queue a hit in memory; queued hits are written by flush_hits()."""
+        key = (text_normalized, voice_id, version_num)
+        now = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        with self._pending_lock:
+            count, _ = self._pending_hits.get(key, (0, now))
+            self._pending_hits[key] = (count + 1, now)
+            pending = len(self._pending_hits)
+        if pending >= HIT_FLUSH_BATCH_SIZE:
+            await asyncio.to_thread(self.flush_hits)
+
+    def flush_hits(self) -> int:
+        """Write queued hits in a single transaction. Returns rows flushed."""
+        with self._pending_lock:
+            pending, self._pending_hits = self._pending_hits, {}
+        if not pending:
+            return 0
+        versioned = [(count, ts, text, voice, version)
+                     for (text, voice, version), (count, ts) in pending.items()
+                     if version is not None]
+        unversioned = [(count, ts, text, voice)
+                       for (text, voice, version), (count, ts) in pending.items()
+                       if version is None]
+        with self._transaction() as conn:
+            if versioned:
+                conn.executemany(
+                    """UPDATE cache_entries SET hit_count = hit_count + ?, last_hit_at = ?
+                       WHERE text_normalized = ? AND voice_id = ? AND version_num = ?""",
+                    versioned
+                )
+            if unversioned:
+                conn.executemany(
+                    """UPDATE cache_entries SET hit_count = hit_count + ?, last_hit_at = ?
+                       WHERE text_normalized = ? AND voice_id = ?""",
+                    unversioned
+                )
+        return len(pending)
 
     def record_miss(self):
         """Increment miss counter."""
@@ -167,63 +318,78 @@ class CacheMetadataDB:
         return self._miss_count
 
     def get_version_count(self, text_normalized: str, voice_id: str) -> int:
-        conn = self._get_conn()
-        row = conn.execute(
-            "SELECT COUNT(*) as cnt FROM cache_entries WHERE text_normalized = ? AND voice_id = ?",
-            (text_normalized, voice_id)
-        ).fetchone()
-        conn.close()
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT COUNT(*) as cnt FROM cache_entries WHERE text_normalized = ? AND voice_id = ?",
+                (text_normalized, voice_id)
+            ).fetchone()
         return row["cnt"] if row else 0
 
     def get_all_entries(self) -> list[dict[str, object]]:
-        conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT text_normalized, voice_id, audio_path, is_filler, version_num FROM cache_entries"
-        ).fetchall()
-        conn.close()
-        return [dict(r) for r in rows]
+        return list(self.iter_all_entries())
+
+    def iter_all_entries(self, batch_size: int = ENTRY_FETCH_BATCH_SIZE) -> Iterator[dict[str, object]]:
+        """Yield all entries batch by batch instead of materializing the table.
+
+        The lock is held per fetchmany, not across yields, so callers may use
+        the DB while iterating. Rows written meanwhile may or may not be seen.
+        """
+        with self._read_lock:
+            cur = self._read_conn.execute(
+                "SELECT text_normalized, voice_id, audio_path, is_filler, version_num FROM cache_entries"
+            )
+            cur.arraysize = batch_size
+        try:
+            while True:
+                with self._read_lock:
+                    batch = cur.fetchmany()
+                if not batch:
+                    return
+                for r in batch:
+                    yield dict(r)
+        finally:
+            cur.close()
 
     def get_all_entries_with_ids(self) -> list[dict[str, object]]:
         """Return all entries including id for integrity checks."""
-        conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT id, text_normalized, voice_id, audio_path, is_filler, version_num FROM cache_entries"
-        ).fetchall()
-        conn.close()
+        with self._read_lock:
+            rows = self._read_conn.execute(
+                "SELECT id, text_normalized, voice_id, audio_path, is_filler, version_num FROM cache_entries"
+            ).fetchall()
         return [dict(r) for r in rows]
 
     def delete_entries_by_ids(self, ids: list[int]) -> int:
         """Bulk delete entries by ID list. Returns count deleted."""
         if not ids:
             return 0
-        conn = self._get_conn()
-        placeholders = ",".join("?" for _ in ids)
-        conn.execute(f"DELETE FROM cache_entries WHERE id IN ({placeholders})", ids)
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            # Chunked so large cleanups stay under SQLite's bound-parameter limit
+            for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                batch = ids[start:start + DELETE_BATCH_SIZE]
+                marks = ",".join("?" * len(batch))
+                conn.execute(f"DELETE FROM cache_entries WHERE id IN ({marks})", batch)
         return len(ids)
 
     def get_stats(self) -> dict[str, object]:
-        conn = self._get_conn()
-        row = conn.execute("""
-            SELECT COUNT(*) as total_entries,
-                   COALESCE(SUM(file_size), 0) as total_size_bytes,
-                   COALESCE(SUM(hit_count), 0) as total_hits,
-                   SUM(CASE WHEN is_filler = 1 THEN 1 ELSE 0 END) as filler_count,
-                   MIN(created_at) as oldest_entry
-            FROM cache_entries
-        """).fetchone()
-        
-        per_voice = conn.execute("""
-            SELECT voice_id,
-                   COUNT(*) as entries,
-                   COALESCE(SUM(hit_count), 0) as hits,
-                   COALESCE(SUM(file_size), 0) as size_bytes
-            FROM cache_entries
-            GROUP BY voice_id
-        """).fetchall()
-        
-        conn.close()
+        self.flush_hits()
+        with self._read_lock:
+            row = self._read_conn.execute("""
+                SELECT COUNT(*) as total_entries,
+                       COALESCE(SUM(file_size), 0) as total_size_bytes,
+                       COALESCE(SUM(hit_count), 0) as total_hits,
+                       SUM(CASE WHEN is_filler = 1 THEN 1 ELSE 0 END) as filler_count,
+                       MIN(created_at) as oldest_entry
+                FROM cache_entries
+            """).fetchone()
+
+            per_voice = self._read_conn.execute("""
+                SELECT voice_id,
+                       COUNT(*) as entries,
+                       COALESCE(SUM(hit_count), 0) as hits,
+                       COALESCE(SUM(file_size), 0) as size_bytes
+                FROM cache_entries
+                GROUP BY voice_id
+            """).fetchall()
         
         if not row:
             return {
@@ -268,49 +434,62 @@ class CacheMetadataDB:
         }
 
     def get_schema_version(self) -> int:
-        conn = self._get_conn()
-        row = conn.execute("SELECT version FROM schema_version").fetchone()
-        conn.close()
+        with self._read_lock:
+            row = self._read_conn.execute("SELECT version FROM schema_version").fetchone()
         return row["version"] if row else 0
 
     def delete_entry(self, entry_id: int) -> Optional[str]:
-        conn = self._get_conn()
-        row = conn.execute("SELECT audio_path FROM cache_entries WHERE id = ?", (entry_id,)).fetchone()
-        if row:
-            conn.execute("DELETE FROM cache_entries WHERE id = ?", (entry_id,))
-            conn.commit()
-            conn.close()
-            return row["audio_path"]
-        conn.close()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT audio_path FROM cache_entries WHERE id = ?", (entry_id,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM cache_entries WHERE id = ?", (entry_id,))
+                return row["audio_path"]
         return None
 
+    def delete_entries(self, entry_ids: Sequence[int]) -> list[str]:
+        """Delete many entries in one transaction; returns their audio paths."""
+        paths: list[str] = []
+        if not entry_ids:
+            return paths
+        with self._transaction() as conn:
+            for start in range(0, len(entry_ids), DELETE_BATCH_SIZE):
+                batch = list(entry_ids[start:start + DELETE_BATCH_SIZE])
+                marks = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT audio_path FROM cache_entries WHERE id IN ({marks})", batch
+                ).fetchall()
+                conn.execute(f"DELETE FROM cache_entries WHERE id IN ({marks})", batch)
+                paths.extend(r["audio_path"] for r in rows)
+        return paths
+
     def delete_all(self) -> list[str]:
-        conn = self._get_conn()
-        rows = conn.execute("SELECT audio_path FROM cache_entries").fetchall()
-        paths = [r["audio_path"] for r in rows]
-        conn.execute("DELETE FROM cache_entries")
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT audio_path FROM cache_entries").fetchall()
+            paths = [r["audio_path"] for r in rows]
+            conn.execute("DELETE FROM cache_entries")
         return paths
 
     def get_eviction_candidates(self, max_entries: int, min_age_days: int) -> list[dict[str, object]]:
-        conn = self._get_conn()
-        candidates = conn.execute(
-            """SELECT id, audio_path, text_normalized, voice_id FROM cache_entries
-               WHERE is_filler = 0 AND hit_count = 0
-               AND created_at < datetime('now', ?)
-               ORDER BY created_at ASC""",
-            (f"-{min_age_days} days",)
-        ).fetchall()
-        result = [dict(r) for r in candidates]
-        current_count = conn.execute("SELECT COUNT(*) as c FROM cache_entries").fetchone()["c"]
-        if current_count - len(result) > max_entries:
-            extra_needed = current_count - len(result) - max_entries
-            extra = conn.execute(
+        self.flush_hits()
+        with self._read_lock:
+            candidates = self._read_conn.execute(
                 """SELECT id, audio_path, text_normalized, voice_id FROM cache_entries
-                   WHERE is_filler = 0 ORDER BY last_hit_at ASC LIMIT ?""",
-                (extra_needed,)
+                   WHERE is_filler = 0 AND hit_count = 0
+                   AND created_at < datetime('now', ?)
+                   ORDER BY created_at ASC""",
+                (f"-{min_age_days} days",)
             ).fetchall()
-            result.extend([dict(r) for r in extra])
-        conn.close()
+            result = [dict(r) for r in candidates]
+            current_count = self._read_conn.execute("SELECT COUNT(*) as c FROM cache_entries").fetchone()["c"]
+            if current_count - len(result) > max_entries:
+                extra_needed = current_count - len(result) - max_entries
+                # Exclude the stale rows already selected above so no id is returned twice
+                extra = self._read_conn.execute(
+                    """SELECT id, audio_path, text_normalized, voice_id FROM cache_entries
+                       WHERE is_filler = 0
+                       AND NOT (hit_count = 0 AND created_at < datetime('now', ?))
+                       ORDER BY last_hit_at ASC LIMIT ?""",
+                    (f"-{min_age_days} days", extra_needed)
+                ).fetchall()
+                result.extend([dict(r) for r in extra])
         return result
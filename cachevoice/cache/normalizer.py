@@ -1,6 +1,7 @@
 """Text normalization pipeline for cache key generation."""
 from __future__ import annotations
 
+import functools
 import re
 from typing import TYPE_CHECKING
 
@@ -10,46 +11,114 @@ if TYPE_CHECKING:
 TURKISH_LOWER_MAP = str.maketrans('Iİ', 'ıi')
 DIACRITIC_MAP = str.maketrans('çğıöşü', 'cgiosu')
 
-# MiniMax TTS syntax patterns
+NORMALIZE_CACHE_SIZE = 4096
+# Longer inputs skip the memo so it can't pin large request bodies; matches
+# the default cache.eviction.max_text_length, above which nothing is stored
+NORMALIZE_CACHE_MAX_TEXT_LENGTH = 500
+
+# Cap on lazily memoized codepoints per _TurkishLowerTable
+_LOWER_TABLE_LIMIT = 4096
+
+
+class _TurkishLowerTable(dict[int, str]):
+    """str.translate table that applies TURKISH_LOWER_MAP and str.lower in one pass.
+
+    Codepoints outside the Turkish overrides are filled in from str.lower on
+    first use, so the result matches translate-then-lower character for character.
+    With `fold`, that mapping is applied to the lowered result as well.
+    """
+
+    def __init__(self, fold: dict[int, int] | None = None):
+        self._fold = fold
+        super().__init__({k: self._folded(chr(v)) for k, v in TURKISH_LOWER_MAP.items()})
+
+    def _folded(self, text: str) -> str:
+        return text.translate(self._fold) if self._fold else text
+
+    def __missing__(self, codepoint: int) -> str:
+        lowered = self._folded(chr(codepoint).lower())
+        if len(self) < _LOWER_TABLE_LIMIT:
+            self[codepoint] = lowered
+        return lowered
+
+
+_TURKISH_LOWER_TABLE = _TurkishLowerTable()
+# turkish_lower followed by DIACRITIC_MAP, as used by normalize()
+_TURKISH_FOLD_TABLE = _TurkishLowerTable(DIACRITIC_MAP)
+
+# MiniMax TTS syntax patterns. Pauses are stripped before interjections, so a
+# pause inside a tag like (la<#1.5#>ughs) exposes the tag to the second pass
 _MINIMAX_PAUSE_RE = re.compile(r'<#[\d.]+#>')
 _MINIMAX_INTERJECTION_RE = re.compile(r'\([a-z_]+\)')
 
+# Cleanup passes, compiled once instead of going through re's pattern cache
+_WS_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_DIGITS_RE = re.compile(r'\d+')
+
 
 def turkish_lower(text: str) -> str:
     """Turkish-aware lowercase. Python's str.lower() handles İ/I incorrectly."""
-    return text.translate(TURKISH_LOWER_MAP).lower()
+    if 'Σ' in text:
+        # str.lower picks final/medial sigma from context; a per-codepoint table can't
+        return text.translate(TURKISH_LOWER_MAP).lower()
+    return text.translate(_TURKISH_LOWER_TABLE)
+
+
+def _lower_and_fold(text: str) -> str:
+    """turkish_lower plus diacritic folding in a single translate."""
+    if 'Σ' in text:
+        return turkish_lower(text).translate(DIACRITIC_MAP)
+    return text.translate(_TURKISH_FOLD_TABLE)
 
 
-def _default_config() -> NormalizeConfig:
+@functools.cache
+def _default_flags() -> tuple[bool, bool, bool, bool, bool]:
     from ..config import NormalizeConfig
-    return NormalizeConfig()
+    return _config_flags(NormalizeConfig())
+
+
+def _config_flags(config: NormalizeConfig) -> tuple[bool, bool, bool, bool, bool]:
+    return (config.strip_minimax, config.lowercase, config.collapse_whitespace,
+            config.strip_punctuation, config.replace_numbers)
 
 
 def normalize(text: str, config: NormalizeConfig | None = None) -> str:
     """Full normalization pipeline for cache key generation."""
+    flags = _default_flags() if config is None else _config_flags(config)
+    if len(text) > NORMALIZE_CACHE_MAX_TEXT_LENGTH:
+        return _normalize_text(text, *flags)
+    return _normalize(text, *flags)
+
+
+def _normalize_text(text: str, strip_minimax: bool, lowercase: bool, collapse_whitespace: bool,
+                    strip_punctuation: bool, replace_numbers: bool) -> str:
     text = text.strip()
     if not text:
         return ""
 
-    if config is None:
-        config = _default_config()
-
     # MiniMax TTS syntax — strip first so markers don't leak into later steps
-    if config.strip_minimax:
-        text = _MINIMAX_PAUSE_RE.sub('', text)
-        text = _MINIMAX_INTERJECTION_RE.sub('', text)
+    if strip_minimax:
+        if '<#' in text:
+            text = _MINIMAX_PAUSE_RE.sub('', text)
+        if '(' in text:
+            text = _MINIMAX_INTERJECTION_RE.sub('', text)
 
-    if config.lowercase:
-        text = turkish_lower(text)
-        text = text.translate(DIACRITIC_MAP)
+    if lowercase:
+        text = _lower_and_fold(text)
 
-    if config.collapse_whitespace:
-        text = re.sub(r'\s+', ' ', text)
+    if collapse_whitespace:
+        text = _WS_RE.sub(' ', text)
 
-    if config.strip_punctuation:
-        text = re.sub(r'[^\w\s]', '', text)
+    if strip_punctuation:
+        text = _PUNCT_RE.sub('', text)
 
-    if config.replace_numbers:
-        text = re.sub(r'\d+', '#', text)
+    if replace_numbers:
+        text = _DIGITS_RE.sub('#', text)
 
     return text.strip()
+
+
+# Memoized on the raw text and config flags: fillers and common prompts
+# repeat across lookup/store calls.
+_normalize = functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(_normalize_text)
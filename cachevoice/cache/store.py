@@ -1,8 +1,11 @@
 """FuzzyCacheStorage — main cache interface combining hot cache + DB."""
 from __future__ import annotations
 import hashlib
+import os
+import tempfile
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
+import anyio
 from .hot import HotCache
 from .matcher import FuzzyMatcher
 from .normalizer import normalize
@@ -11,6 +14,38 @@ if TYPE_CHECKING:
     from ..config import FuzzyConfig, NormalizeConfig
     from .metadata import CacheMetadataDB
 
+# Converted renditions of cached files live in this subdirectory of the audio
+# dir, named <cached file name>.<format>; they are derived data, not DB entries.
+CONVERTED_DIR = "converted"
+CONVERTED_FORMATS = ("opus", "ogg", "wav")
+
+
+def converted_path(audio_path: str, fmt: str) -> str:
+    """Path of the `fmt` rendition of a cached audio file."""
+    head, name = os.path.split(audio_path)
+    return os.path.join(head, CONVERTED_DIR, f"{name}.{fmt}")
+
+
+def write_atomic(path: str | os.PathLike[str], data: bytes) -> None:
+    """Write `data` to `path` via a unique temp file and os.replace.
+
+    Readers streaming the old file keep their handle and never see a
+    partially written one. Temp files end in ".tmp" so the integrity check
+    can sweep ones left behind by a crash.
+    """
+    head, name = os.path.split(os.fspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=head, prefix=f"{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 class FuzzyCacheStorage:
     def __init__(self, audio_dir: str, fuzzy_config: FuzzyConfig | None = None,
@@ -33,8 +68,24 @@ class FuzzyCacheStorage:
     def matcher(self) -> FuzzyMatcher:
         return self._matcher
 
-    def lookup(self, text: str, voice_id: str) -> Optional[dict[str, object]]:
-        return self._matcher.find(text, voice_id)
+    def lookup(
+        self, text: str, voice_id: str, normalized: str | None = None,
+    ) -> Optional[dict[str, object]]:
+        """Cache lookup; pass `normalized` when the caller already has normalize(text)."""
+        if normalized is None:
+            return self._matcher.find(text, voice_id)
+        return self._matcher.find_normalized(normalized, voice_id)
+
+    async def lookup_async(
+        self, text: str, voice_id: str, normalized: str | None = None,
+    ) -> Optional[dict[str, object]]:
+        if normalized is None:
+            return await self._matcher.find_async(text, voice_id)
+        return await self._matcher.find_normalized_async(normalized, voice_id)
+
+    def lookup_many(self, texts: list[str], voice_id: str) -> list[Optional[dict[str, object]]]:
+        """Batched lookup(); fuzzy misses are scored in one process.cdist call."""
+        return self._matcher.find_many(texts, voice_id)
 
     def store(
         self,
@@ -44,6 +95,44 @@ class FuzzyCacheStorage:
         audio_format: str = "mp3",
         version_num: int | None = None,
     ) -> str:
+        normalized, version_num, filepath = self._prepare_and_write(
+            text, voice_id, audio_data, audio_format, version_num,
+        )
+        self._hot.add(normalized, voice_id, str(filepath))
+        self._add_db_entry(text, normalized, voice_id, filepath, audio_data, audio_format, version_num)
+        return str(filepath)
+
+    async def store_async(
+        self,
+        text: str,
+        voice_id: str,
+        audio_data: bytes,
+        audio_format: str = "mp3",
+        version_num: int | None = None,
+    ) -> str:
+        """store() with the version lookup, file write and DB insert run in worker threads."""
+        normalized, version_num, filepath = await anyio.to_thread.run_sync(
+            self._prepare_and_write, text, voice_id, audio_data, audio_format, version_num,
+        )
+        self._hot.add(normalized, voice_id, str(filepath))
+        if self._db is not None:
+            await anyio.to_thread.run_sync(
+                self._add_db_entry, text, normalized, voice_id, filepath, audio_data, audio_format, version_num,
+            )
+        return str(filepath)
+
+    def _prepare_and_write(
+        self, text: str, voice_id: str, audio_data: bytes, audio_format: str, version_num: int | None,
+    ) -> tuple[str, int, Path]:
+        # One unit for store_async's worker thread: the version count is a DB
+        # read behind the metadata lock, so it must stay off the event loop too
+        prepared = self._prepare_store(text, voice_id, audio_format, version_num)
+        write_atomic(prepared[2], audio_data)
+        return prepared
+
+    def _prepare_store(
+        self, text: str, voice_id: str, audio_format: str, version_num: int | None,
+    ) -> tuple[str, int, Path]:
         normalized = normalize(text, self._normalize_config)
         if version_num is None and self._db is not None:
             existing_versions = self._db.get_version_count(normalized, voice_id)
@@ -52,28 +141,30 @@ class FuzzyCacheStorage:
             version_num = 1
 
         filename = self._make_filename(normalized, voice_id, audio_format, version_num)
-        filepath = self._audio_dir / filename
-        filepath.write_bytes(audio_data)
-        self._hot.add(normalized, voice_id, str(filepath))
+        return normalized, version_num, self._audio_dir / filename
 
-        if self._db is not None:
-            self._db.add_entry(
-                text_original=text,
-                text_normalized=normalized,
-                voice_id=voice_id,
-                audio_path=str(filepath),
-                audio_format=audio_format,
-                file_size=len(audio_data),
-                version_num=version_num,
-            )
-        return str(filepath)
+    def _add_db_entry(
+        self, text: str, normalized: str, voice_id: str, filepath: Path,
+        audio_data: bytes, audio_format: str, version_num: int,
+    ):
+        if self._db is None:
+            return
+        self._db.add_entry(
+            text_original=text,
+            text_normalized=normalized,
+            voice_id=voice_id,
+            audio_path=str(filepath),
+            audio_format=audio_format,
+            file_size=len(audio_data),
+            version_num=version_num,
+        )
 
     def _make_filename(self, normalized_text: str, voice_id: str, fmt: str, version_num: int = 1) -> str:
         if version_num <= 1:
             key = f"{normalized_text}:{voice_id}:{fmt}"
         else:
             key = f"{normalized_text}:{voice_id}:{fmt}:{version_num}"
-        h = hashlib.md5(key.encode()).hexdigest()[:16]
+        h = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
         return f"{h}.{fmt}"
 
     def clear(self):
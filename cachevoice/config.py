@@ -5,11 +5,28 @@ import os
 import re
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 _ENV_PATTERN = re.compile(r"\$\{([^}]+)\}")
 
 
+def resolve_api_key(api_key: str | None) -> str | None:
+    """Usable API key, or None for empty values and ${VAR} left unset in the environment."""
+    if api_key is None:
+        return None
+    stripped = api_key.strip()
+    if not stripped or (stripped.startswith("${") and stripped.endswith("}")):
+        return None
+    return api_key
+
+
 def _resolve_env_vars(value: Any) -> Any:
     if isinstance(value, str):
+        if "${" not in value:
+            return value
         return _ENV_PATTERN.sub(
             lambda m: os.environ.get(m.group(1), m.group(0)), value
         )
@@ -36,6 +53,14 @@ class ProviderConfig(BaseModel):
             self.litellm_model = self.model
         return self
 
+    @property
+    def resolved_api_key(self) -> str | None:
+        """api_key, or None when it is empty or an unresolved ${VAR} placeholder."""
+        return resolve_api_key(self.api_key)
+
+
+_RESERVED_PROVIDER_KEYS = frozenset({"default", "fallback_chain"})
+
 
 class ProvidersConfig(BaseModel):
     default: str = ""
@@ -48,12 +73,9 @@ class ProvidersConfig(BaseModel):
         if not isinstance(data, dict):
             return data
         configs: dict[str, Any] = {}
-        reserved = {"default", "fallback_chain"}
         leftover: dict[str, Any] = {}
         for k, v in data.items():
-            if k in reserved:
-                leftover[k] = v
-            elif isinstance(v, dict):
+            if k not in _RESERVED_PROVIDER_KEYS and isinstance(v, dict):
                 configs[k] = v
             else:
                 leftover[k] = v
@@ -116,7 +138,7 @@ class Settings(BaseSettings):
     @classmethod
     def from_yaml(cls, path: str = "cachevoice.yaml") -> "Settings":
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YamlLoader)
         data = _resolve_env_vars(data)
         return cls(**data)
 
@@ -2,6 +2,7 @@
 from __future__ import annotations
 import logging
 from typing import Optional, Protocol
+import anyio
 from ..cache.metadata import CacheMetadataDB
 from ..cache.normalizer import normalize
 from ..cache.store import FuzzyCacheStorage
@@ -23,53 +24,67 @@ FILLER_TEMPLATES = [
 class FillerManager:
     def __init__(self, db: CacheMetadataDB, store: FuzzyCacheStorage,
                  gateway: Optional[_SynthesizerGateway] = None,
-                 templates: Optional[list[dict[str, str]]] = None):
+                 templates: Optional[list[dict[str, str]]] = None,
+                 max_concurrency: int = 4):
         self._db = db
         self._store = store
         self._gateway = gateway
         self._templates = templates or FILLER_TEMPLATES
+        self._max_concurrency = max(1, max_concurrency)
+        # (id, text, normalized) per template; the list is fixed for the manager's lifetime
+        self._templates_norm = [(t["id"], t["text"], normalize(t["text"])) for t in self._templates]
 
     async def generate_fillers(self, voice_id: str) -> list[dict[str, object]]:
         """Generate filler audio for all templates. Returns list of generated entries."""
         if not self._gateway:
             raise RuntimeError("No TTS gateway configured")
+        gateway = self._gateway
+        sem = anyio.Semaphore(self._max_concurrency)
+        results: list[dict[str, object]] = [{} for _ in self._templates_norm]
 
-        generated = []
-        for tmpl in self._templates:
-            text = tmpl["text"]
-            normalized = normalize(text)
+        async def _one(index: int, filler_id: str, text: str, normalized: str):
+            results[index] = await _generate(filler_id, text, normalized)
 
+        async def _generate(filler_id: str, text: str, normalized: str) -> dict[str, object]:
             # Skip if already cached
-            existing = self._store.lookup(text, voice_id)
+            existing = self._store.matcher.find_normalized(normalized, voice_id)
             if existing:
-                logger.info("Filler already cached: %s", tmpl["id"])
-                generated.append({"id": tmpl["id"], "text": text, "status": "exists"})
-                continue
+                logger.info("Filler already cached: %s", filler_id)
+                return {"id": filler_id, "text": text, "status": "exists"}
 
             try:
-                audio_data = await self._gateway.synthesize(text, voice_id)
-                audio_path = self._store.store(text, voice_id, audio_data)
-                self._db.add_entry(
+                async with sem:
+                    audio_data = await gateway.synthesize(text, voice_id)
+                audio_path = await self._store.store_async(text, voice_id, audio_data)
+                await self._db.add_entry_async(
                     text_original=text, text_normalized=normalized,
                     voice_id=voice_id, audio_path=audio_path,
                     file_size=len(audio_data), is_filler=True,
                 )
-                generated.append({"id": tmpl["id"], "text": text, "status": "generated"})
-                logger.info("Generated filler: %s", tmpl["id"])
+                logger.info("Generated filler: %s", filler_id)
+                return {"id": filler_id, "text": text, "status": "generated"}
             except Exception as e:
-                logger.error("Failed to generate filler %s: %s", tmpl["id"], e)
-                generated.append({"id": tmpl["id"], "text": text, "status": "error", "error": str(e)})
+                logger.error("Failed to generate filler %s: %s", filler_id, e)
+                return {"id": filler_id, "text": text, "status": "error", "error": str(e)}
 
-        return generated
+        # Templates are independent; synthesize them concurrently, bounded by the semaphore.
+        # anyio rather than asyncio.gather so this runs under any backend the app uses.
+        async with anyio.create_task_group() as tg:
+            for index, tmpl in enumerate(self._templates_norm):
+                tg.start_soon(_one, index, *tmpl)
+        return results
 
     def list_fillers(self, voice_id: str) -> list[dict[str, object]]:
         """List available filler audio for a voice."""
         results = []
-        for tmpl in self._templates:
-            cached = self._store.lookup(tmpl["text"], voice_id)
+        # One batched lookup: exact hits from the dict, misses share a single fuzzy pass
+        matches = self._store.matcher.find_many_normalized(
+            [normalized for _, _, normalized in self._templates_norm], voice_id,
+        )
+        for (filler_id, text, _), cached in zip(self._templates_norm, matches):
             results.append({
-                "id": tmpl["id"],
-                "text": tmpl["text"],
+                "id": filler_id,
+                "text": text,
                 "cached": cached is not None,
                 "audio_path": cached["audio_path"] if cached else None,
             })
@@ -1,8 +1,6 @@
 """Microsoft Edge TTS gateway — free, no API key required."""
 from __future__ import annotations
 import logging
-import os
-import tempfile
 from typing import Optional
 
 logger = logging.getLogger("cachevoice.gateway")
@@ -30,26 +28,18 @@ class EdgeTTSProvider:
         import edge_tts
 
         voice_id = voice or self._default_voice
-        fd, mp3_path = tempfile.mkstemp(suffix=".mp3")
-        os.close(fd)
+        audio = bytearray()
 
         try:
             comm = edge_tts.Communicate(text, voice_id)
-            await comm.save(mp3_path)
-            
-            with open(mp3_path, "rb") as f:
-                audio_bytes = f.read()
-            
-            return audio_bytes
+            # Collect audio chunks in memory instead of round-tripping through a temp file
+            async for chunk in comm.stream():
+                if chunk["type"] == "audio":
+                    audio.extend(chunk["data"])
+            return bytes(audio)
         except Exception as e:
             logger.error(f"Edge TTS synthesis failed: {e}")
             raise
-        finally:
-            # Cleanup temp file
-            try:
-                os.unlink(mp3_path)
-            except Exception:
-                pass
 
     @property
     def default_voice(self) -> str:
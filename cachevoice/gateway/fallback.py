@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import deque
 from dataclasses import dataclass
 import asyncio
 import logging
 import time
-from typing import Callable, Protocol
+from typing import Awaitable, Callable, Protocol
 
 import httpx
 from fastapi import HTTPException
@@ -21,8 +21,12 @@ class _EdgeProviderProtocol(Protocol):
     async def synthesize(self, text: str, voice: str | None = None) -> bytes: ...
 
 
+_ProviderCall = Callable[[str, str, str, str], Awaitable[bytes]]
+
+
 @dataclass
 class _CircuitState:
+    # Most recent failure timestamps, capped at failure_threshold entries
     failures: deque[float]
     open_until: float = 0.0
 
@@ -46,9 +50,16 @@ class FallbackOrchestrator:
         self._failure_window_seconds: int = failure_window_seconds
         self._cooldown_seconds: int = cooldown_seconds
         self._now_fn: Callable[[], float] = now_fn or time.monotonic
-        self._circuit: dict[str, _CircuitState] = defaultdict(
-            lambda: _CircuitState(failures=deque())
-        )
+        # One state per chain entry up front, so checks on the request path never allocate
+        self._circuit: dict[str, _CircuitState] = {
+            name: self._new_circuit_state() for name in fallback_chain
+        }
+        # Chain entry (as configured) -> bound call, resolved once instead of per request
+        self._dispatch: dict[str, _ProviderCall] = {}
+        for name in fallback_chain:
+            call = self._resolve_provider(name)
+            if call is not None:
+                self._dispatch[name] = call
 
     @property
     def available(self) -> bool:
@@ -62,7 +73,8 @@ class FallbackOrchestrator:
         model: str | None = None,
         response_format: str = "mp3",
     ) -> bytes:
-        errors: list[str] = []
+        # (provider, exception); stringified only if every provider fails
+        errors: list[tuple[str, Exception]] = []
         effective_voice = voice or "alloy"
         effective_model = model or "tts-1"
 
@@ -90,15 +102,14 @@ class FallbackOrchestrator:
             except Exception as exc:
                 status_code = self._extract_status_code(exc)
                 should_fallback = self._should_fallback(status_code, exc)
-                error_text = str(exc)
 
                 logger.warning(
                     "fallback.fail provider=%s status=%s error=%s",
                     provider_name,
                     status_code,
-                    error_text,
+                    exc,
                 )
-                errors.append(f"{provider_name}: {error_text}")
+                errors.append((provider_name, exc))
 
                 if self._count_failure(status_code, exc):
                     self._record_failure(provider_name)
@@ -106,11 +117,10 @@ class FallbackOrchestrator:
                 if not should_fallback:
                     raise self._to_http_exception(exc, status_code)
 
-        raise HTTPException(
-            status_code=503,
-            detail="TTS unavailable: all fallback providers failed"
-            + (f" ({'; '.join(errors)})" if errors else ""),
-        )
+        detail = "TTS unavailable: all fallback providers failed"
+        if errors:
+            detail += " (" + "; ".join(f"{name}: {exc}" for name, exc in errors) + ")"
+        raise HTTPException(status_code=503, detail=detail)
 
     async def _call_provider(
         self,
@@ -121,17 +131,29 @@ class FallbackOrchestrator:
         model: str,
         response_format: str,
     ) -> bytes:
+        call = self._dispatch.get(provider_name)
+        if call is None:
+            raise RuntimeError(f"Unknown fallback provider '{provider_name}'")
+        return await call(text, voice, model, response_format)
+
+    def _resolve_provider(self, provider_name: str) -> _ProviderCall | None:
         provider_key = provider_name.lower()
         if provider_key == "litellm":
-            return await self._litellm_router.synthesize(
-                text,
-                voice,
-                model,
-                response_format,
-            )
+            return self._call_litellm
         if provider_key in {"edge", "edge_tts", "edgetts"}:
-            return await self._edge_provider.synthesize(text, voice)
-        raise RuntimeError(f"Unknown fallback provider '{provider_name}'")
+            return self._call_edge
+        return None
+
+    async def _call_litellm(self, text: str, voice: str, model: str, response_format: str) -> bytes:
+        return await self._litellm_router.synthesize(
+            text,
+            voice,
+            model,
+            response_format,
+        )
+
+    async def _call_edge(self, text: str, voice: str, model: str, response_format: str) -> bytes:
+        return await self._edge_provider.synthesize(text, voice)
 
     def _extract_status_code(self, exc: Exception) -> int | None:
         if isinstance(exc, HTTPException):
@@ -157,10 +179,16 @@ class FallbackOrchestrator:
 
     def _record_failure(self, provider_name: str) -> None:
         now = self._now_fn()
-        state = self._circuit[provider_name]
-        self._prune_old_failures(state, now)
+        state = self._circuit.get(provider_name)
+        if state is None:
+            state = self._circuit[provider_name] = self._new_circuit_state()
         state.failures.append(now)
-        if len(state.failures) >= self._failure_threshold:
+        # The deque only keeps the last failure_threshold timestamps, so the
+        # threshold is reached within the window iff the oldest kept one is inside it.
+        if (
+            len(state.failures) >= self._failure_threshold
+            and state.failures[0] >= now - self._failure_window_seconds
+        ):
             state.open_until = now + self._cooldown_seconds
             logger.warning(
                 "fallback.circuit-open provider=%s failures=%d window=%ds cooldown=%ds",
@@ -170,26 +198,26 @@ class FallbackOrchestrator:
                 self._cooldown_seconds,
             )
 
+    def _new_circuit_state(self) -> _CircuitState:
+        return _CircuitState(failures=deque(maxlen=max(1, self._failure_threshold)))
+
     def _clear_failures(self, provider_name: str) -> None:
-        state = self._circuit[provider_name]
+        state = self._circuit.get(provider_name)
+        if state is None:
+            return
         state.failures.clear()
         state.open_until = 0.0
 
     def _is_circuit_open(self, provider_name: str) -> bool:
-        state = self._circuit[provider_name]
+        state = self._circuit.get(provider_name)
+        if state is None or not state.open_until:
+            return False
         now = self._now_fn()
-        self._prune_old_failures(state, now)
         if state.open_until > now:
             return True
-        if state.open_until:
-            state.open_until = 0.0
+        state.open_until = 0.0
         return False
 
-    def _prune_old_failures(self, state: _CircuitState, now: float) -> None:
-        cutoff = now - self._failure_window_seconds
-        while state.failures and state.failures[0] < cutoff:
-            _ = state.failures.popleft()
-
     def _to_http_exception(self, exc: Exception, status_code: int | None) -> HTTPException:
         if isinstance(exc, HTTPException):
             return exc
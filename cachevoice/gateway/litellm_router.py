@@ -1,34 +1,81 @@
 from __future__ import annotations
 
 import logging
-from typing import Protocol, cast
+import time
+from typing import Callable, Protocol, cast
 
+import anyio
 from litellm import provider_list
 from litellm.router import Router
 
 from ..config import ProviderConfig, Settings
-from .mapping import ModelMapper, VoiceMapper
+from .mapping import ModelMapper, VoiceMapper, flatten_mapping
 
 logger = logging.getLogger("cachevoice.gateway")
 
+_InflightKey = tuple[str, str, str, str]
+# (provider, route_name, mapped default voice) for one attempt in the fallback order
+_RouteStep = tuple[str, str, str]
+
+# How long a provider that just failed is skipped before it gets another try
+PROVIDER_COOLDOWN_SECONDS = 30.0
+
+
+class _InflightCall:
+    """Outcome of an upstream synthesis shared by concurrent identical requests."""
+
+    def __init__(self) -> None:
+        self.done = anyio.Event()
+        self.result: bytes | None = None
+        self.error: BaseException | None = None
+
+    async def wait(self) -> bytes | None:
+        """Shared result, or None if the caller running the call was cancelled."""
+        await self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
 
 class LiteLLMRouter:
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        cooldown_seconds: float = PROVIDER_COOLDOWN_SECONDS,
+        now_fn: Callable[[], float] | None = None,
+    ):
         self._settings: Settings = settings
         self._voice_mapper: VoiceMapper
         self._model_mapper: ModelMapper
         self._provider_order: list[str]
         self._route_index: dict[tuple[str, str], str]
         self._router: Router | None
+        self._inflight: dict[_InflightKey, _InflightCall]
+        self._voice_index: dict[tuple[str, str], str]
+        self._model_index: dict[tuple[str, str], str]
+        self._route_plans: dict[str, tuple[_RouteStep, ...]]
+        self._default_plan: tuple[_RouteStep, ...]
+        # provider -> monotonic time until which it is skipped after a failure
+        self._cooldown_until: dict[str, float]
+        self._cooldown_seconds: float
+        self._now_fn: Callable[[], float]
 
         self._settings = settings
         self._voice_mapper = VoiceMapper({"voice_mapping": settings.voice_mapping})
         self._model_mapper = ModelMapper({"model_mapping": settings.model_mapping})
+        self._voice_index = self._mapping_index(self._voice_mapper.table, settings.voice_mapping)
+        self._model_index = self._mapping_index(self._model_mapper.table, settings.model_mapping)
         self._provider_order = self._build_provider_order()
         self._route_index = {}
+        self._inflight = {}
+        self._cooldown_until = {}
+        self._cooldown_seconds = cooldown_seconds
+        self._now_fn = now_fn or time.monotonic
 
         model_list = self._build_model_list()
         self._router = Router(model_list=model_list) if model_list else None
+        self._route_plans, self._default_plan = self._build_route_plans()
 
         if self._router:
             logger.info("LiteLLM router initialized with %d deployment(s)", len(model_list))
@@ -49,38 +96,88 @@ class LiteLLMRouter:
         if not self._router:
             raise RuntimeError("No TTS gateway configured")
 
-        requested_model = model or "tts-1"
+        # Single-flight: a burst of identical requests shares one upstream call.
+        # Check-and-insert has no await in between, so no lock is needed.
+        key: _InflightKey = (text, voice or "", model or "", response_format)
+        while (call := self._inflight.get(key)) is not None:
+            result = await call.wait()
+            if result is not None:
+                return result
+            # The caller running the shared call was cancelled (e.g. a client
+            # disconnect); the first waiter to wake takes over as the new caller
+
+        call = self._inflight[key] = _InflightCall()
+        try:
+            call.result = await self._synthesize_uncached(text, voice, model, response_format)
+            return call.result
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            del self._inflight[key]
+            call.done.set()
+
+    async def _synthesize_uncached(
+        self,
+        text: str,
+        voice: str | None,
+        model: str | None,
+        response_format: str,
+    ) -> bytes:
+        router = cast(Router, self._router)
+        plan = self._route_plans.get(model or "tts-1", self._default_plan)
         last_error: Exception | None = None
 
-        for provider in self._provider_order:
-            route_name = self._route_index.get((provider, requested_model), provider)
-            provider_cfg = self._settings.providers.configs.get(provider)
-            if not provider_cfg:
-                continue
-
-            provider_voice = self._map_voice(voice or provider_cfg.default_voice or "alloy", provider)
+        for provider, route_name, default_voice in self._without_cooling(plan):
+            provider_voice = self._map_voice(voice, provider) if voice else default_voice
 
             try:
-                response = await self._router.aspeech(
+                response = await router.aspeech(
                     model=route_name,
                     input=text,
                     voice=provider_voice,
                     response_format=response_format,
                 )
-                return self._as_bytes(response)
+                audio = self._as_bytes(response)
             except Exception as exc:
                 last_error = exc
+                if self._is_transient(exc):
+                    self._cooldown_until[provider] = self._now_fn() + self._cooldown_seconds
                 logger.error(
                     "LiteLLM aspeech failed for provider '%s' (route=%s): %s",
                     provider,
                     route_name,
                     exc,
                 )
+            else:
+                self._cooldown_until.pop(provider, None)
+                return audio
 
         if last_error:
             raise last_error
         raise RuntimeError("No TTS providers configured")
 
+    def _without_cooling(self, plan: tuple[_RouteStep, ...]) -> tuple[_RouteStep, ...]:
+        """Drop providers still cooling down from a recent failure.
+
+        Once the cooldown expires the provider is tried again on the next
+        request (the half-open probe). If every provider is cooling, the full
+        plan is used so a request is never failed without an attempt.
+        """
+        if not self._cooldown_until:
+            return plan
+        now = self._now_fn()
+        ready = tuple(step for step in plan if self._cooldown_until.get(step[0], 0.0) <= now)
+        return ready or plan
+
+    @staticmethod
+    def _is_transient(exc: Exception) -> bool:
+        """Rate limits, 5xx and errors without a status (timeouts, connection failures)."""
+        status_code = getattr(exc, "status_code", None)
+        if not isinstance(status_code, int):
+            return True
+        return status_code == 429 or status_code >= 500
+
     def _build_provider_order(self) -> list[str]:
         providers = [self._settings.providers.default, *self._settings.providers.fallback_chain]
         ordered: list[str] = []
@@ -101,12 +198,37 @@ class LiteLLMRouter:
 
         return ordered
 
+    def _build_route_plans(self) -> tuple[dict[str, tuple[_RouteStep, ...]], tuple[_RouteStep, ...]]:
+        """Resolve route name and default voice per provider once, per requested model.
+
+        Models without a dedicated route fall back to each provider's default
+        deployment, which is also the plan for models not listed at all.
+        """
+        default_voices: dict[str, str] = {}
+        for provider in self._provider_order:
+            provider_cfg = self._settings.providers.configs[provider]
+            default_voices[provider] = self._map_voice(provider_cfg.default_voice or "alloy", provider)
+
+        default_plan = tuple((p, p, default_voices[p]) for p in self._provider_order)
+        models = {model for _, model in self._route_index}
+        plans = {
+            model: tuple(
+                (p, self._route_index.get((p, model), p), default_voices[p]) for p in self._provider_order
+            )
+            for model in models
+        }
+        return plans, default_plan
+
     def _build_model_list(self) -> list[dict[str, object]]:
         model_list: list[dict[str, object]] = []
 
         generic_models: set[str] = {"tts-1"}
         generic_models.update(self._extract_generic_models())
 
+        # Identical litellm_params -> model_name of the deployment already emitted
+        # for them; generic models that resolve to the same call share it
+        seen: dict[tuple[tuple[str, object], ...], str] = {}
+
         for provider in self._provider_order:
             provider_cfg = self._settings.providers.configs.get(provider)
             if not provider_cfg:
@@ -115,6 +237,7 @@ class LiteLLMRouter:
             default_deployment = self._deployment_for(provider, provider_cfg.litellm_model)
             if default_deployment:
                 model_list.append(default_deployment)
+                seen.setdefault(self._params_key(default_deployment), provider)
 
             for generic_model in sorted(generic_models):
                 mapped_model = self._map_model(generic_model, provider)
@@ -122,11 +245,20 @@ class LiteLLMRouter:
                 deployment_model = self._compose_provider_model(provider_cfg.litellm_model, mapped_model)
                 deployment = self._deployment_for(route_name, deployment_model, provider_cfg)
                 if deployment:
-                    model_list.append(deployment)
-                    self._route_index[(provider, generic_model)] = route_name
+                    params_key = self._params_key(deployment)
+                    existing = seen.get(params_key)
+                    if existing is None:
+                        model_list.append(deployment)
+                        seen[params_key] = existing = route_name
+                    self._route_index[(provider, generic_model)] = existing
 
         return model_list
 
+    @staticmethod
+    def _params_key(deployment: dict[str, object]) -> tuple[tuple[str, object], ...]:
+        params = cast(dict[str, object], deployment["litellm_params"])
+        return tuple(sorted(params.items()))
+
     def _deployment_for(
         self,
         model_name: str,
@@ -150,7 +282,8 @@ class LiteLLMRouter:
             logger.warning("Skipping model '%s': unsupported LiteLLM provider", deployment_model)
             return None
 
-        if not self._has_api_key(cfg.api_key) and not deployment_model.startswith("edge/"):
+        api_key = cfg.resolved_api_key
+        if api_key is None and not deployment_model.startswith("edge/"):
             logger.warning("Skipping provider '%s' because api_key is empty", model_name)
             return None
 
@@ -160,8 +293,8 @@ class LiteLLMRouter:
         }
         if cfg.base_url:
             litellm_params["api_base"] = cfg.base_url
-        if cfg.api_key:
-            litellm_params["api_key"] = cfg.api_key
+        if api_key is not None:
+            litellm_params["api_key"] = api_key
 
         return {
             "model_name": model_name,
@@ -186,27 +319,25 @@ class LiteLLMRouter:
                     generic_models.add(key)
         return generic_models
 
+    @staticmethod
+    def _mapping_index(
+        mapper_table: dict[tuple[str, str], str],
+        raw_mapping: object,
+    ) -> dict[tuple[str, str], str]:
+        """(name, provider) -> mapped name across both mapping layouts.
+
+        Entries keyed by OpenAI name (name -> provider -> mapped) come from the
+        mapper and win over provider-keyed ones (provider -> name -> mapped).
+        """
+        index = {(name, provider): mapped for (provider, name), mapped in flatten_mapping(raw_mapping).items()}
+        index.update({key: mapped for key, mapped in mapper_table.items() if mapped != key[0]})
+        return index
+
     def _map_voice(self, voice: str, provider: str) -> str:
-        mapped = self._voice_mapper.map(voice, provider)
-        if mapped != voice:
-            return mapped
-        provider_map = self._settings.voice_mapping.get(provider)
-        if isinstance(provider_map, dict):
-            mapped_provider = provider_map.get(voice)
-            if isinstance(mapped_provider, str):
-                return mapped_provider
-        return mapped
+        return self._voice_index.get((voice, provider), voice)
 
     def _map_model(self, model: str, provider: str) -> str:
-        mapped = self._model_mapper.map(model, provider)
-        if mapped != model:
-            return mapped
-        provider_map = self._settings.model_mapping.get(provider)
-        if isinstance(provider_map, dict):
-            mapped_provider = provider_map.get(model)
-            if isinstance(mapped_provider, str):
-                return mapped_provider
-        return mapped
+        return self._model_index.get((model, provider), model)
 
     @staticmethod
     def _compose_provider_model(base_model: str, mapped_model: str) -> str:
@@ -219,15 +350,6 @@ class LiteLLMRouter:
             return f"{prefix}/{mapped_model}"
         return mapped_model
 
-    @staticmethod
-    def _has_api_key(api_key: str | None) -> bool:
-        if api_key is None:
-            return False
-        stripped = api_key.strip()
-        if not stripped:
-            return False  # Empty string means no key provided
-        return not (stripped.startswith("${") and stripped.endswith("}"))
-
     @staticmethod
     def _as_bytes(response: object) -> bytes:
         if isinstance(response, bytes):
@@ -3,6 +3,19 @@
 from typing import Any
 
 
+def flatten_mapping(mappings: Any) -> dict[tuple[str, str], str]:
+    """Flatten {outer: {inner: mapped}} into {(outer, inner): mapped}, skipping malformed entries."""
+    if not isinstance(mappings, dict):
+        return {}
+    return {
+        (outer, inner): mapped
+        for outer, inner_map in mappings.items()
+        if isinstance(inner_map, dict)
+        for inner, mapped in inner_map.items()
+        if isinstance(mapped, str)
+    }
+
+
 class VoiceMapper:
     """Maps OpenAI voice names to provider-specific voice names."""
 
@@ -19,6 +32,13 @@ class VoiceMapper:
             minimax: "Deep_Voice_Man"
         """
         self._mappings: dict[str, dict[str, str]] = config.get("voice_mapping", {})
+        # (voice, provider) -> mapped name, built once so map() is a single lookup
+        self._flat: dict[tuple[str, str], str] = flatten_mapping(self._mappings)
+
+    @property
+    def table(self) -> dict[tuple[str, str], str]:
+        """Flattened (voice, provider) -> mapped name table."""
+        return self._flat
 
     def map(self, voice: str, provider: str) -> str:
         """
@@ -31,11 +51,7 @@ class VoiceMapper:
         Returns:
             Mapped voice name, or original if no mapping exists
         """
-        if voice in self._mappings:
-            provider_map = self._mappings[voice]
-            if provider in provider_map:
-                return provider_map[provider]
-        return voice
+        return self._flat.get((voice, provider), voice)
 
 
 class ModelMapper:
@@ -54,6 +70,13 @@ class ModelMapper:
             minimax: "speech-01-hd"
         """
         self._mappings: dict[str, dict[str, str]] = config.get("model_mapping", {})
+        # (model, provider) -> mapped name, built once so map() is a single lookup
+        self._flat: dict[tuple[str, str], str] = flatten_mapping(self._mappings)
+
+    @property
+    def table(self) -> dict[tuple[str, str], str]:
+        """Flattened (model, provider) -> mapped name table."""
+        return self._flat
 
     def map(self, model: str, provider: str) -> str:
         """
@@ -66,8 +89,4 @@ class ModelMapper:
         Returns:
             Mapped model name, or original if no mapping exists
         """
-        if model in self._mappings:
-            provider_map = self._mappings[model]
-            if provider in provider_map:
-                return provider_map[provider]
-        return model
+        return self._flat.get((model, provider), model)
@@ -6,15 +6,21 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 import logging
 import asyncio
+import anyio
 import hashlib
+import orjson
 import tempfile
+import time
 import subprocess
 import os
-import sqlite3
-from typing import cast
+import shutil
+import weakref
+from collections import OrderedDict
+from stat import S_ISREG
+from typing import Any, cast
 
 from .config import Settings
-from .cache.store import FuzzyCacheStorage
+from .cache.store import CONVERTED_DIR, FuzzyCacheStorage, converted_path, write_atomic
 from .cache.metadata import CacheMetadataDB
 from .cache.normalizer import normalize
 from .cache.evictor import CacheEvictor
@@ -48,53 +54,157 @@ _settings: Settings | None = None
 _evictor: CacheEvictor | None = None
 _write_counter: int = 0
 _eviction_task: asyncio.Task[None] | None = None
-_variety_in_flight: set[tuple[str, str]] = set()
+_hit_flush_task: asyncio.Task[None] | None = None
+# Startup integrity check, running in the background once the hot cache is loaded
+_integrity_task: asyncio.Task[None] | None = None
+# Set every EVICTION_WRITE_INTERVAL writes; wakes _periodic_eviction early.
+# Created in lifespan so it belongs to the serving event loop.
+_eviction_trigger: asyncio.Event | None = None
+EVICTION_WRITE_INTERVAL = 100
+# Background variety generations by (text_normalized, voice). Holding the task
+# dedupes repeat requests and keeps it from being garbage-collected mid-run.
+_variety_in_flight: dict[tuple[str, str], asyncio.Task[None]] = {}
+
+# Converted audio for cache hits, keyed by (audio_path, mtime_ns, size, format) so a
+# rewritten file never serves stale bytes. LRU bounded by total size.
+_CONVERTED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_converted_cache: OrderedDict[tuple[str, int, int, str], bytes] = OrderedDict()
+_converted_cache_bytes: int = 0
+# Per-key locks so concurrent hits for the same conversion run ffmpeg once
+_conversion_locks: weakref.WeakValueDictionary[tuple[str, int, int, str], anyio.Lock] = (
+    weakref.WeakValueDictionary()
+)
+# Fillers can be regenerated under the same name, so no `immutable`
+_FILLER_CACHE_CONTROL = "public, max-age=86400"
+# (fillers dir, dir mtime_ns, sorted filler names) from the last /v1/fillers listing
+_filler_list_cache: tuple[Path, int, list[str]] | None = None
+# Filler path -> (mtime_ns, size, etag); the ETag is only recomputed when the file changes
+_etag_cache: dict[Path, tuple[int, int, str]] = {}
+# Files the startup integrity check considers: cached audio, plus temp files
+# left behind by an interrupted write_atomic
+_CACHE_FILE_SUFFIXES = (".mp3", ".ogg", ".wav", ".opus", ".tmp")
 
 
 def _startup_integrity_check(
     db: CacheMetadataDB, store: FuzzyCacheStorage, audio_dir: str
 ) -> None:
+    orphans, orphan_files_removed = _reconcile_cache_files(db, audio_dir)
+    _forget_orphans(store, orphans, orphan_files_removed)
+
+
+async def _background_integrity_check(
+    db: CacheMetadataDB, store: FuzzyCacheStorage, audio_dir: str
+) -> None:
+    """_startup_integrity_check with the disk and DB work in a worker thread.
+
+    Lets the server take requests while a large cache dir is reconciled; the
+    hot cache is only touched back on the event loop.
+    """
+    try:
+        orphans, orphan_files_removed = await anyio.to_thread.run_sync(
+            _reconcile_cache_files, db, audio_dir,
+        )
+    except Exception as e:
+        logger.error("Startup integrity check failed: %s", e)
+        return
+    _forget_orphans(store, orphans, orphan_files_removed)
+
+
+def _forget_orphans(
+    store: FuzzyCacheStorage, orphans: list[tuple[str, str]], orphan_files_removed: int
+) -> None:
+    for text_normalized, voice_id in orphans:
+        store.hot_cache.remove(text_normalized, voice_id)
+    logger.info(
+        "Startup: removed %d orphan DB entries, %d orphan files",
+        len(orphans),
+        orphan_files_removed,
+    )
+
+
+def _reconcile_cache_files(
+    db: CacheMetadataDB, audio_dir: str
+) -> tuple[list[tuple[str, str]], int]:
+    """Drop DB entries whose audio is gone and files no entry references.
+
+    Returns the (text_normalized, voice_id) of removed entries and the number
+    of files deleted. Safe to run while requests write new entries: files
+    modified after the check started are never treated as orphans.
+    """
+    started = time.time()
     audio_dir_path = Path(audio_dir)
-    fillers_dir = audio_dir_path / "fillers"
+    real_audio_dir = os.path.realpath(audio_dir_path)
+
+    # One directory listing instead of a stat per DB entry
+    on_disk: set[str] = set()
+    if audio_dir_path.is_dir():
+        with os.scandir(real_audio_dir) as it:
+            on_disk = {
+                f.path for f in it
+                if f.name.endswith(_CACHE_FILE_SUFFIXES) and f.is_file(follow_symlinks=False)
+            }
+
+    # DB paths keyed like scandir entries: real parent dir + file name, with
+    # the parent resolved once per distinct directory
+    real_dirs: dict[str, str] = {}
+
+    def _key(path: str) -> str:
+        head, name = os.path.split(path)
+        real = real_dirs.get(head)
+        if real is None:
+            real = real_dirs[head] = os.path.realpath(head)
+        return os.path.join(real, name)
+
+    def _is_stale(path: str) -> bool:
+        try:
+            return os.stat(path).st_mtime < started
+        except OSError:
+            return False
 
-    # Phase 1: DB entries with missing audio files
+    # Phase 1: DB entries with missing audio files. Misses from the listing
+    # are re-checked, since the file may have been written after the scandir.
     entries = db.get_all_entries_with_ids()
     orphan_db_ids: list[int] = []
+    orphans: list[tuple[str, str]] = []
+    db_paths: set[str] = set()
     for entry in entries:
-        if not Path(str(entry["audio_path"])).exists():
+        key = _key(str(entry["audio_path"]))
+        if key in on_disk or os.path.exists(key):
+            db_paths.add(key)
+        else:
             orphan_db_ids.append(int(cast(int, entry["id"])))
-            store.hot_cache.remove(
-                str(entry["text_normalized"]), str(entry["voice_id"])
-            )
+            orphans.append((str(entry["text_normalized"]), str(entry["voice_id"])))
 
     db.delete_entries_by_ids(orphan_db_ids)
 
-    # Phase 2: Audio files not referenced in DB (skip fillers dir)
-    db_paths: set[str] = set()
-    for entry in entries:
-        if int(cast(int, entry["id"])) not in orphan_db_ids:
-            db_paths.add(str(Path(str(entry["audio_path"])).resolve()))
-
+    # Phase 2: Audio files not referenced in DB (fillers live in a subdirectory)
     orphan_files_removed = 0
-    if audio_dir_path.exists():
-        for f in audio_dir_path.iterdir():
-            if not f.is_file():
-                continue
-            if f.suffix not in (".mp3", ".ogg", ".wav", ".opus"):
-                continue
-            resolved = str(f.resolve())
-            if resolved not in db_paths:
+    for orphan in on_disk - db_paths:
+        if not _is_stale(orphan):
+            continue
+        try:
+            os.unlink(orphan)
+            orphan_files_removed += 1
+        except OSError:
+            pass
+
+    # Phase 3: converted renditions whose source file is no longer referenced
+    converted_dir = os.path.join(real_audio_dir, CONVERTED_DIR)
+    if os.path.isdir(converted_dir):
+        with os.scandir(converted_dir) as it:
+            for f in it:
+                stem, suffix = os.path.splitext(f.name)
+                if suffix != ".tmp" and os.path.join(real_audio_dir, stem) in db_paths:
+                    continue
+                if not _is_stale(f.path):
+                    continue
                 try:
-                    f.unlink()
+                    os.unlink(f.path)
                     orphan_files_removed += 1
                 except OSError:
                     pass
 
-    logger.info(
-        "Startup: removed %d orphan DB entries, %d orphan files",
-        len(orphan_db_ids),
-        orphan_files_removed,
-    )
+    return orphans, orphan_files_removed
 
 
 def _load_settings() -> Settings:
@@ -111,19 +221,41 @@ async def _periodic_eviction():
         return
     
     interval_seconds = _settings.cache.eviction.cleanup_interval_hours * 3600
+    trigger = _eviction_trigger
     while True:
-        await asyncio.sleep(interval_seconds)
+        if trigger is None:
+            await asyncio.sleep(interval_seconds)
+        else:
+            # Wake on the interval or early when the write path asks for a pass
+            try:
+                await asyncio.wait_for(trigger.wait(), timeout=interval_seconds)
+            except TimeoutError:
+                pass
+            trigger.clear()
         try:
-            removed = _evictor.run()
+            removed = await _evictor.run_async()
             if removed > 0:
                 logger.info("Periodic eviction removed %d entries", removed)
         except Exception as e:
             logger.error("Periodic eviction failed: %s", e)
 
 
+async def _periodic_hit_flush(interval_seconds: float = 1.0):
+    """Background task: write coalesced cache hits to the DB."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        if not _db:
+            continue
+        try:
+            await asyncio.to_thread(_db.flush_hits)
+        except Exception as e:
+            logger.error("Hit flush failed: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global _store, _db, _gateway, _filler_mgr, _settings, _evictor, _eviction_task, _write_counter
+    global _hit_flush_task, _eviction_trigger, _integrity_task
     _settings = _load_settings()
     _setup_logging(_settings.server.log_level)
     logger.info("CacheClaw starting on port %s...", _settings.server.port)
@@ -135,11 +267,14 @@ async def lifespan(app: FastAPI):
         variety_depth=_settings.cache.variety_depth,
     )
 
-    entries = _db.get_all_entries()
-    _store.hot_cache.load_entries(cast(list[dict[str, str]], entries))
-    logger.info("Loaded %d cache entries into hot cache", len(entries))
+    loaded = _store.hot_cache.load_entries(_db.iter_all_entries())
+    logger.info("Loaded %d cache entries into hot cache", loaded)
 
-    _startup_integrity_check(_db, _store, _settings.cache.audio_dir)
+    # Reconciliation can take a while on a large cache dir; hits for entries
+    # it will drop just fall through to synthesis while it runs
+    _integrity_task = asyncio.create_task(
+        _background_integrity_check(_db, _store, _settings.cache.audio_dir)
+    )
 
     litellm_router = LiteLLMRouter(_settings)
 
@@ -183,18 +318,24 @@ async def lifespan(app: FastAPI):
         _settings.cache.eviction.min_age_days,
     )
     _write_counter = 0
+    _eviction_trigger = asyncio.Event()
     _eviction_task = asyncio.create_task(_periodic_eviction())
+    _hit_flush_task = asyncio.create_task(_periodic_hit_flush())
     logger.info("Cache evictor initialized (interval=%dh, max_entries=%d)", 
                 _settings.cache.eviction.cleanup_interval_hours, _settings.cache.eviction.max_entries)
 
     yield
     
-    if _eviction_task:
-        _eviction_task.cancel()
-        try:
-            await _eviction_task
-        except asyncio.CancelledError:
-            pass
+    # The check's worker thread can't be cancelled; let it finish before the DB closes
+    await _integrity_task
+    for task in (_eviction_task, _hit_flush_task):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    _db.close()
     logger.info("CacheClaw shutting down...")
 
 
@@ -212,8 +353,9 @@ def _schedule_variety_generation(
     key = (text_normalized, voice)
     if key in _variety_in_flight:
         return
-    _variety_in_flight.add(key)
-    asyncio.create_task(_generate_variety(text, voice, model, response_format, version_num))
+    _variety_in_flight[key] = asyncio.create_task(
+        _generate_variety(text, voice, model, response_format, version_num)
+    )
 
 
 def _get_variety_depth() -> int:
@@ -246,19 +388,19 @@ async def _generate_variety(
         audio_data = await _gateway.synthesize(text, voice, model, "mp3")
         provider_format = "mp3"
         if response_format != "mp3":
-            converted = _convert_audio_format(audio_data, response_format)
+            converted = await _convert_audio_format(audio_data, response_format)
             if converted:
                 audio_data = converted
                 provider_format = response_format
 
-        audio_path = _store.store(
+        audio_path = await _store.store_async(
             text,
             voice,
             audio_data,
             provider_format,
             version_num=version_num,
         )
-        _db.add_entry(
+        await _db.add_or_hit_entry_async(
             text_original=text,
             text_normalized=text_normalized,
             voice_id=voice,
@@ -268,75 +410,128 @@ async def _generate_variety(
             file_size=len(audio_data),
             version_num=version_num,
         )
-    except sqlite3.IntegrityError:
-        if _db:
-            try:
-                await _db.record_hit_async(text_normalized, voice, version_num=version_num)
-            except TypeError:
-                await _db.record_hit_async(text_normalized, voice)
     except Exception as e:
         logger.warning("Variety generation failed for '%s': %s", text_preview, e)
     finally:
-        _variety_in_flight.discard(key)
+        _variety_in_flight.pop(key, None)
+
+
+# Response media type per output format
+_CONTENT_TYPES: dict[str, str] = {"mp3": "audio/mpeg", "opus": "audio/ogg", "ogg": "audio/ogg", "wav": "audio/wav"}
+# Filler file extensions in lookup order, with their media types
+_FILLER_MEDIA_TYPES: tuple[tuple[str, str], ...] = ((".mp3", "audio/mpeg"), (".ogg", "audio/ogg"))
+_FILLER_EXTENSIONS: tuple[str, ...] = tuple(ext for ext, _ in _FILLER_MEDIA_TYPES)
+
+FFMPEG_TIMEOUT_SECONDS = 30
+# Clips are short: skip banner/progress output and keep the encoder on one
+# thread, since spinning up more costs more than the encode itself
+_FFMPEG_GLOBAL_ARGS = ("-y", "-hide_banner", "-nostats", "-loglevel", "error")
+_FFMPEG_OUTPUT_ARGS = ("-vn", "-threads", "1")
+# ffmpeg encoder arguments per target format; input is always mp3 from the provider
+_FFMPEG_ENCODE_ARGS: dict[str, list[str]] = {
+    # OGG Opus container for Telegram voice
+    "opus": ["-c:a", "libopus", "-b:a", "64k", "-ar", "48000", "-ac", "1", "-application", "voip", "-f", "ogg"],
+    "wav": ["-f", "wav"],
+    # OGG Vorbis
+    "ogg": ["-c:a", "libvorbis", "-q:a", "4", "-f", "ogg"],
+}
+
+
+def _is_mp3_frame_header(audio_data: bytes) -> bool:
+    """Bare MPEG audio Layer III frame: 11 sync bits, a valid version, layer bits 01.
+
+    ADTS AAC (FF F1 / FF F9) shares the sync word but has layer bits 00, so
+    it is left to ffmpeg's probing.
+    """
+    if len(audio_data) < 2 or audio_data[0] != 0xFF:
+        return False
+    b1 = audio_data[1]
+    return b1 & 0xE0 == 0xE0 and b1 & 0x18 != 0x08 and b1 & 0x06 == 0x02
+
+
+def _input_demuxer(audio_data: bytes) -> list[str]:
+    """`-f <demuxer>` for input recognised from its magic bytes, so ffmpeg skips probing."""
+    if audio_data.startswith(b"ID3") or _is_mp3_frame_header(audio_data):
+        return ["-f", "mp3"]
+    if audio_data.startswith(b"OggS"):
+        return ["-f", "ogg"]
+    if audio_data.startswith(b"RIFF") and audio_data[8:12] == b"WAVE":
+        return ["-f", "wav"]
+    return []
+
+
+# Codec each Ogg output format carries, matched against _ogg_codec()
+_OGG_TARGET_CODECS: dict[str, str] = {"opus": "opus", "ogg": "vorbis"}
+
+
+def _ogg_codec(audio_data: bytes) -> str | None:
+    """Codec of an Ogg stream, read from the identification header in its first page."""
+    if not audio_data.startswith(b"OggS"):
+        return None
+    # Header: 27 fixed bytes, then the segment table, then the first packet
+    if len(audio_data) < 27:
+        return None
+    packet = audio_data[27 + audio_data[26]:][:8]
+    if packet.startswith(b"OpusHead"):
+        return "opus"
+    if packet.startswith(b"\x01vorbis"):
+        return "vorbis"
+    return None
 
 
-def _convert_audio_format(audio_data: bytes, target_format: str) -> bytes | None:
+async def _convert_audio_format(audio_data: bytes, target_format: str) -> bytes | None:
     """Convert audio bytes to target format using ffmpeg.
-    
+
+    Input is piped through stdin and OGG output read back from stdout. WAV
+    still goes through a temp file because its muxer seeks back to patch the
+    RIFF chunk sizes, which a pipe can't do. ffmpeg runs as an async
+    subprocess, so a slow transcode holds neither the event loop nor a
+    worker thread.
+
     Args:
         audio_data: Input audio bytes (assumed mp3 from provider)
         target_format: Target format (opus, wav, ogg)
-    
+
     Returns:
         Converted audio bytes or None if conversion fails
     """
-    if target_format not in ("opus", "wav", "ogg"):
+    encode_args = _FFMPEG_ENCODE_ARGS.get(target_format)
+    if encode_args is None:
         return None
-    
-    input_fd, input_path = tempfile.mkstemp(suffix=".mp3")
-    output_fd, output_path = tempfile.mkstemp(suffix=f".{target_format}")
-    
+    if _ogg_codec(audio_data) == _OGG_TARGET_CODECS.get(target_format):
+        # Already the target codec in an Ogg stream: rewrite framing only
+        encode_args = ["-c", "copy", "-f", "ogg"]
+
+    output_path: str | None = None
     try:
-        os.write(input_fd, audio_data)
-        os.close(input_fd)
-        os.close(output_fd)
-        
-        if target_format == "opus":
-            # OGG Opus container for Telegram voice
-            cmd = [
-                "ffmpeg", "-y", "-i", input_path,
-                "-c:a", "libopus", "-b:a", "64k",
-                "-ar", "48000", "-ac", "1",
-                "-application", "voip",
-                "-f", "ogg", output_path
-            ]
-        elif target_format == "wav":
-            cmd = [
-                "ffmpeg", "-y", "-i", input_path,
-                "-f", "wav", output_path
-            ]
-        elif target_format == "ogg":
-            # OGG Vorbis
-            cmd = [
-                "ffmpeg", "-y", "-i", input_path,
-                "-c:a", "libvorbis", "-q:a", "4",
-                "-f", "ogg", output_path
-            ]
-        
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=30
-        )
-        
+        if target_format == "wav":
+            output_fd, output_path = tempfile.mkstemp(suffix=".wav")
+            os.close(output_fd)
+
+        cmd = [
+            "ffmpeg", *_FFMPEG_GLOBAL_ARGS, *_input_demuxer(audio_data), "-i", "pipe:0",
+            *_FFMPEG_OUTPUT_ARGS, *encode_args, output_path or "pipe:1",
+        ]
+        with anyio.fail_after(FFMPEG_TIMEOUT_SECONDS):
+            result = await anyio.run_process(
+                cmd,
+                input=audio_data,
+                stdout=subprocess.DEVNULL if output_path else subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+
         if result.returncode != 0:
             logger.warning(f"ffmpeg conversion to {target_format} failed (exit {result.returncode})")
             return None
-        
-        with open(output_path, "rb") as f:
-            return f.read()
-    
+
+        if output_path is None:
+            return result.stdout
+        return await anyio.to_thread.run_sync(_read_file, output_path)
+
+    except TimeoutError:
+        logger.warning(f"ffmpeg conversion to {target_format} timed out")
+        return None
     except FileNotFoundError:
         logger.warning("ffmpeg not found, format conversion unavailable")
         return None
@@ -344,13 +539,87 @@ def _convert_audio_format(audio_data: bytes, target_format: str) -> bytes | None
         logger.error(f"Audio conversion error: {e}")
         return None
     finally:
-        for path in [input_path, output_path]:
+        if output_path:
             try:
-                os.unlink(path)
-            except (OSError, UnboundLocalError):
+                os.unlink(output_path)
+            except OSError:
                 pass
 
 
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def _convert_cached(audio_path: str, target_format: str) -> bytes | None:
+    """Converted bytes for a cached audio file, memoized per file version and format.
+
+    Raises FileNotFoundError if the cached file is gone.
+    """
+    stat = await anyio.to_thread.run_sync(os.stat, audio_path)
+    key = (audio_path, stat.st_mtime_ns, stat.st_size, target_format)
+    converted = _converted_cache.get(key)
+    if converted is not None:
+        _converted_cache.move_to_end(key)
+        return converted
+
+    lock = _conversion_locks.get(key)
+    if lock is None:
+        lock = _conversion_locks[key] = anyio.Lock()
+    async with lock:
+        converted = _converted_cache.get(key)
+        if converted is not None:
+            return converted
+        rendition_path = converted_path(audio_path, target_format)
+        converted = await anyio.to_thread.run_sync(_read_rendition, rendition_path, stat.st_mtime_ns)
+        if converted is None:
+            audio_data = await anyio.to_thread.run_sync(_read_file, audio_path)
+            converted = await _convert_audio_format(audio_data, target_format)
+            if converted:
+                await anyio.to_thread.run_sync(_write_rendition, rendition_path, converted)
+        if converted:
+            _remember_converted(key, converted)
+        return converted
+
+
+def _read_rendition(path: str, source_mtime_ns: int) -> bytes | None:
+    """Stored conversion, unless missing or not strictly newer than its source file."""
+    try:
+        if os.stat(path).st_mtime_ns <= source_mtime_ns:
+            return None
+        return _read_file(path)
+    except FileNotFoundError:
+        return None
+
+
+def _write_rendition(path: str, data: bytes) -> None:
+    # Best effort: a failed write only means the next restart converts again.
+    # write_atomic's unique temp file keeps concurrent conversions of the same
+    # rendition (keyed on different source versions) from clobbering each other.
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, data)
+    except OSError as e:
+        logger.warning("Could not store converted audio %s: %s", path, e)
+
+
+def _remember_converted(key: tuple[str, int, int, str], converted: bytes) -> None:
+    global _converted_cache_bytes
+    if len(converted) > _CONVERTED_CACHE_MAX_BYTES:
+        return
+    _converted_cache[key] = converted
+    _converted_cache_bytes += len(converted)
+    while _converted_cache_bytes > _CONVERTED_CACHE_MAX_BYTES:
+        _, evicted = _converted_cache.popitem(last=False)
+        _converted_cache_bytes -= len(evicted)
+
+
+def _clear_converted_cache() -> None:
+    global _converted_cache_bytes
+    _converted_cache.clear()
+    _converted_cache_bytes = 0
+
+
 @app.get("/health")
 async def health():
     provider_status = "unknown"
@@ -372,9 +641,14 @@ async def health():
     return response
 
 
+async def _read_json(request: Request) -> Any:
+    """Request.json() with orjson in place of the stdlib decoder."""
+    return orjson.loads(await request.body())
+
+
 @app.post("/v1/audio/speech")
 async def audio_speech(request: Request):
-    body = await request.json()
+    body = await _read_json(request)
     text = body.get("input", "")
     voice = body.get("voice", "Decent_Boy")
     model = body.get("model", "tts-1")
@@ -383,23 +657,24 @@ async def audio_speech(request: Request):
     if not text:
         return Response(content=b"", status_code=400)
 
+    # Normalized once per request and shared by lookup, hit accounting and store
+    normalized = normalize(text)
+
     # Cache lookup with format-specific key
     if _store and _settings and _settings.cache.enabled:
-        result = _store.lookup(text, voice)
+        result = await _store.lookup_async(text, voice, normalized=normalized)
         if result:
             audio_path = cast(str, result["audio_path"])
-            cached_format = Path(audio_path).suffix[1:]
+            cached_format = os.path.splitext(audio_path)[1][1:]
             
             try:
-                audio_data = Path(audio_path).read_bytes()
-                
                 match_type = result["match_type"]
                 reason_code = "exact_hit" if match_type == "exact" else "fuzzy_hit"
                 
+                converted = None
                 if cached_format != response_format and response_format != "mp3":
-                    converted = _convert_audio_format(audio_data, response_format)
+                    converted = await _convert_cached(audio_path, response_format)
                     if converted:
-                        audio_data = converted
                         logger.info(
                             "Cache HIT + converted | reason_code=%s text_preview='%s' voice_id=%s score=%s format=%s->%s",
                             reason_code, text[:50], voice, result["score"], cached_format, response_format
@@ -407,17 +682,21 @@ async def audio_speech(request: Request):
                     else:
                         logger.warning("Cache HIT but conversion failed, using cached format")
                         response_format = cached_format
+                # Unconverted hits are streamed from disk; stat now so a vanished
+                # file still falls through to synthesis below
+                file_stat = None
+                if not converted:
+                    file_stat = await anyio.to_thread.run_sync(os.stat, audio_path)
                 
                 if _db:
-                    matched_normalized = cast(
-                        str,
-                        result.get("matched", result.get("normalized", normalize(text))),
-                    )
-                    request_normalized = cast(str, result.get("normalized", normalize(text)))
+                    request_normalized = cast(str, result.get("normalized") or normalized)
+                    matched_normalized = cast(str, result.get("matched") or request_normalized)
                     await _db.record_hit_async(matched_normalized, voice)
 
                     if hasattr(_db, "get_version_count"):
-                        version_count = _db.get_version_count(request_normalized, voice)
+                        version_count = await anyio.to_thread.run_sync(
+                            _db.get_version_count, request_normalized, voice,
+                        )
                         variety_depth = _get_variety_depth()
                         if version_count < variety_depth:
                             _schedule_variety_generation(
@@ -434,8 +713,10 @@ async def audio_speech(request: Request):
                     reason_code, text[:50], voice, result["score"]
                 )
                 
-                content_type = {"mp3": "audio/mpeg", "opus": "audio/ogg", "ogg": "audio/ogg", "wav": "audio/wav"}.get(response_format, "audio/mpeg")
-                return Response(content=audio_data, media_type=content_type)
+                content_type = _CONTENT_TYPES.get(response_format, "audio/mpeg")
+                if not converted:
+                    return FileResponse(audio_path, media_type=content_type, stat_result=file_stat)
+                return Response(content=converted, media_type=content_type)
             except FileNotFoundError:
                 logger.warning(
                     "Cache lookup failed | reason_code=error_file_not_found text_preview='%s' voice_id=%s audio_path=%s",
@@ -458,7 +739,7 @@ async def audio_speech(request: Request):
     # Convert if non-mp3 format requested
     provider_format = "mp3"
     if response_format != "mp3":
-        converted = _convert_audio_format(audio_data, response_format)
+        converted = await _convert_audio_format(audio_data, response_format)
         if converted:
             audio_data = converted
             provider_format = response_format
@@ -477,21 +758,15 @@ async def audio_speech(request: Request):
             )
         else:
             _db.record_miss()
-            normalized = normalize(text)
-            audio_path = _store.store(text, voice, audio_data, provider_format)
-            try:
-                try:
-                    _db.add_entry(
-                        text_original=text, text_normalized=normalized, voice_id=voice,
-                        audio_path=audio_path, model=model, audio_format=provider_format,
-                        file_size=len(audio_data), version_num=1,
-                    )
-                except TypeError:
-                    _db.add_entry(
-                        text_original=text, text_normalized=normalized, voice_id=voice,
-                        audio_path=audio_path, model=model, audio_format=provider_format,
-                        file_size=len(audio_data),
-                    )
+            audio_path = await _store.store_async(text, voice, audio_data, provider_format)
+            # A concurrent miss for the same text may have inserted first; the
+            # upsert then counts this request as a hit on that row.
+            _, inserted = await _db.add_or_hit_entry_async(
+                text_original=text, text_normalized=normalized, voice_id=voice,
+                audio_path=audio_path, model=model, audio_format=provider_format,
+                file_size=len(audio_data), version_num=1,
+            )
+            if inserted:
                 logger.info(
                     "Cache MISS | reason_code=miss text_preview='%s' voice_id=%s format=%s",
                     text[:50], voice, provider_format
@@ -506,23 +781,18 @@ async def audio_speech(request: Request):
                         response_format=response_format,
                         version_num=2,
                     )
-            except sqlite3.IntegrityError:
-                await _db.record_hit_async(normalized, voice)
+            else:
                 logger.info(
                     "Cache MISS handled as HIT | reason_code=miss_race_duplicate text_preview='%s' voice_id=%s",
                     text[:50], voice
                 )
             
-            global _write_counter, _evictor
+            global _write_counter
             _write_counter += 1
-            if _write_counter >= 100 and _evictor:
+            if _write_counter >= EVICTION_WRITE_INTERVAL and _evictor and _eviction_trigger:
                 _write_counter = 0
-                try:
-                    removed = _evictor.run()
-                    if removed > 0:
-                        logger.info("Write-triggered eviction removed %d entries", removed)
-                except Exception as e:
-                    logger.error("Write-triggered eviction failed: %s", e)
+                # The eviction pass itself runs in the background task, off this request
+                _eviction_trigger.set()
     else:
         if _db:
             _db.record_miss()
@@ -531,7 +801,7 @@ async def audio_speech(request: Request):
             text[:50], voice
         )
 
-    content_type = {"mp3": "audio/mpeg", "opus": "audio/ogg", "ogg": "audio/ogg", "wav": "audio/wav"}.get(response_format, "audio/mpeg")
+    content_type = _CONTENT_TYPES.get(response_format, "audio/mpeg")
     return Response(content=audio_data, media_type=content_type)
 
 
@@ -539,7 +809,7 @@ async def audio_speech(request: Request):
 async def cache_stats():
     if not _db:
         return {"error": "not initialized"}
-    stats = _db.get_stats()
+    stats = await anyio.to_thread.run_sync(_db.get_stats)
     stats["hot_cache_size"] = _store.size if _store else 0
     return stats
 
@@ -548,8 +818,14 @@ async def cache_stats():
 async def cache_clear():
     if not _db or not _store:
         return {"error": "not initialized"}
-    paths = _db.delete_all()
+    if _integrity_task:
+        # Don't let a finishing reconciliation prune the hot cache after the clear
+        await _integrity_task
+    paths = await anyio.to_thread.run_sync(_db.delete_all)
     _store.clear()
+    _clear_converted_cache()
+    if _settings:
+        shutil.rmtree(Path(_settings.cache.audio_dir) / CONVERTED_DIR, ignore_errors=True)
     removed_files = 0
     for p in paths:
         try:
@@ -569,7 +845,7 @@ async def list_fillers(voice_id: str = "Decent_Boy"):
 
 @app.post("/v1/cache/fillers/generate")
 async def generate_fillers(request: Request):
-    body = await request.json()
+    body = await _read_json(request)
     voice_id = body.get("voice_id", "Decent_Boy")
     if not _filler_mgr:
         return {"error": "not initialized"}
@@ -583,16 +859,49 @@ async def get_fillers():
     if not _settings:
         raise HTTPException(status_code=503, detail="Server not initialized")
     
+    global _filler_list_cache
     fillers_dir = Path(_settings.cache.audio_dir) / "fillers"
-    if not fillers_dir.exists():
+    try:
+        mtime_ns = fillers_dir.stat().st_mtime_ns
+    except FileNotFoundError:
         return {"fillers": []}
     
-    filler_names = []
-    for audio_file in fillers_dir.iterdir():
-        if audio_file.is_file() and audio_file.suffix in [".mp3", ".ogg"]:
-            filler_names.append(audio_file.stem)
+    # Adding, removing or renaming a filler bumps the directory mtime
+    cached = _filler_list_cache
+    if cached and cached[0] == fillers_dir and cached[1] == mtime_ns:
+        return {"fillers": list(cached[2])}
     
-    return {"fillers": sorted(filler_names)}
+    # scandir entries carry the file type, so is_file() needs no extra stat
+    with os.scandir(fillers_dir) as entries:
+        filler_names = sorted(
+            entry.name[:-4] for entry in entries
+            if entry.name.endswith(_FILLER_EXTENSIONS) and entry.is_file()
+        )
+    _filler_list_cache = (fillers_dir, mtime_ns, filler_names)
+    return {"fillers": list(filler_names)}
+
+
+def _filler_etag(audio_path: Path, stat: os.stat_result) -> str:
+    """ETag derived from file mtime and size, memoized per path."""
+    cached = _etag_cache.get(audio_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    etag = hashlib.blake2b(f"{stat.st_mtime_ns}:{stat.st_size}".encode(), digest_size=8).hexdigest()
+    _etag_cache[audio_path] = (stat.st_mtime_ns, stat.st_size, etag)
+    return etag
+
+
+def _find_filler(fillers_dir: Path, name: str) -> tuple[Path, str, os.stat_result] | None:
+    """First filler file for `name` in _FILLER_MEDIA_TYPES order, with its stat."""
+    for ext, mime in _FILLER_MEDIA_TYPES:
+        candidate = fillers_dir / f"{name}{ext}"
+        try:
+            stat = candidate.stat()
+        except OSError:
+            continue
+        if S_ISREG(stat.st_mode):
+            return candidate, mime, stat
+    return None
 
 
 @app.get("/v1/fillers/{name}")
@@ -603,32 +912,21 @@ async def get_filler_audio(name: str, request: Request):
     
     fillers_dir = Path(_settings.cache.audio_dir) / "fillers"
     
-    # Try .mp3 first, then .ogg
-    audio_path = None
-    content_type = None
-    for ext, mime in [(".mp3", "audio/mpeg"), (".ogg", "audio/ogg")]:
-        candidate = fillers_dir / f"{name}{ext}"
-        if candidate.exists():
-            audio_path = candidate
-            content_type = mime
-            break
-    
-    if not audio_path:
+    found = await anyio.to_thread.run_sync(_find_filler, fillers_dir, name)
+    if found is None:
         raise HTTPException(status_code=404, detail=f"Filler '{name}' not found")
-    
-    # Generate ETag from file mtime and size
-    stat = audio_path.stat()
-    etag = hashlib.md5(f"{stat.st_mtime}:{stat.st_size}".encode()).hexdigest()
+    audio_path, content_type, stat = found
+    etag = _filler_etag(audio_path, stat)
     
     # Check If-None-Match header
     if_none_match = request.headers.get("if-none-match")
     if if_none_match and if_none_match.strip('"') == etag:
         return Response(status_code=304)
     
-    # Return audio file with ETag
-    audio_data = audio_path.read_bytes()
-    return Response(
-        content=audio_data,
+    # Return audio file with ETag; FileResponse streams it (sendfile where available)
+    return FileResponse(
+        path=audio_path,
         media_type=content_type,
-        headers={"ETag": f'"{etag}"'}
+        headers={"ETag": f'"{etag}"', "Cache-Control": _FILLER_CACHE_CONTROL},
+        stat_result=stat,
     )
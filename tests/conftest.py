@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # The app runs on asyncio under uvicorn (lifespan tasks, asyncio.Event),
+    # so async tests only need the asyncio backend
+    return "asyncio"
@@ -2,13 +2,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from types import SimpleNamespace
 from collections.abc import Generator
-import json
-from typing import TypedDict, cast
+from typing import TypedDict
 
+import httpx
 import pytest
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import Receive
 import cachevoice.server as server
 
 
@@ -47,6 +44,9 @@ class StubStore:
         self.lookup_calls.append((text, voice_id))
         return self.lookup_result
 
+    async def lookup_async(self, text: str, voice_id: str, normalized: str | None = None):
+        return self.lookup(text, voice_id)
+
     def store(self, text: str, voice_id: str, audio_data: bytes, audio_format: str = "mp3"):
         self.store_calls.append(
             {
@@ -58,6 +58,9 @@ class StubStore:
         )
         return f"/tmp/stored-audio.{audio_format}"
 
+    async def store_async(self, text: str, voice_id: str, audio_data: bytes, audio_format: str = "mp3"):
+        return self.store(text, voice_id, audio_data, audio_format)
+
 
 class StubDB:
     def __init__(self):
@@ -70,6 +73,14 @@ class StubDB:
     def record_miss(self):
         pass
 
+    async def add_entry_async(self, **fields: object):
+        return self.add_entry(**fields)  # type: ignore[arg-type]
+
+    async def add_or_hit_entry_async(self, version_num: int = 1, **fields: object):
+        _ = version_num
+        self.add_entry(**fields)  # type: ignore[arg-type]
+        return len(self.add_entry_calls), True
+
     def add_entry(
         self,
         text_original: str,
@@ -120,34 +131,21 @@ class ApiEnv:
     tmp_path: Path
 
 
-async def call_audio_speech(payload: dict[str, str]) -> Response:
-    body = json.dumps(payload).encode()
-
-    async def receive() -> dict[str, object]:
-        return {"type": "http.request", "body": body, "more_body": False}
-
-    request = Request(
-        {
-            "type": "http",
-            "http_version": "1.1",
-            "method": "POST",
-            "scheme": "http",
-            "path": "/v1/audio/speech",
-            "raw_path": b"/v1/audio/speech",
-            "query_string": b"",
-            "headers": [(b"content-type", b"application/json")],
-            "client": ("testclient", 50000),
-            "server": ("testserver", 80),
-        },
-        cast(Receive, receive),
-    )
-    return await server.audio_speech(request)
+async def _post_json(path: str, payload: dict[str, str]) -> httpx.Response:
+    # Through the real ASGI stack, without running the app lifespan
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(path, json=payload)
+
+
+async def call_audio_speech(payload: dict[str, str]) -> httpx.Response:
+    return await _post_json("/v1/audio/speech", payload)
 
 
 @pytest.fixture(autouse=True)
 def mock_audio_conversion(monkeypatch: pytest.MonkeyPatch):
     """Mock audio conversion to avoid ffmpeg dependency in tests."""
-    def fake_convert(audio_data: bytes, target_format: str) -> bytes | None:
+    async def fake_convert(audio_data: bytes, target_format: str) -> bytes | None:
         return audio_data
     monkeypatch.setattr("cachevoice.server._convert_audio_format", fake_convert)
 
@@ -180,7 +178,7 @@ async def test_valid_tts_request_returns_audio_bytes_and_mp3_headers(api_env: Ap
     )
 
     assert response.status_code == 200
-    assert response.body == b"mp3-audio"
+    assert response.content == b"mp3-audio"
     assert response.headers["content-type"] == "audio/mpeg"
     assert response.headers["content-length"] == str(len(b"mp3-audio"))
 
@@ -191,7 +189,7 @@ async def test_missing_text_returns_400_with_empty_body(api_env: ApiEnv):
     response = await call_audio_speech({"voice": "Decent_Boy"})
 
     assert response.status_code == 400
-    assert response.body == b""
+    assert response.content == b""
 
 
 @pytest.mark.anyio
@@ -201,7 +199,7 @@ async def test_missing_voice_uses_default_voice_and_returns_ogg(api_env: ApiEnv)
     response = await call_audio_speech({"input": "hello without voice", "response_format": "ogg"})
 
     assert response.status_code == 200
-    assert response.body == b"ogg-audio"
+    assert response.content == b"ogg-audio"
     assert response.headers["content-type"] == "audio/ogg"
     assert api_env.gateway.calls[-1]["voice"] == "Decent_Boy"
 
@@ -220,7 +218,7 @@ async def test_cache_hit_returns_cached_audio_without_gateway_call(api_env: ApiE
     response = await call_audio_speech({"input": "hello", "voice": "Decent_Boy", "response_format": "mp3"})
 
     assert response.status_code == 200
-    assert response.body == b"cached-audio"
+    assert response.content == b"cached-audio"
     assert response.headers["content-type"] == "audio/mpeg"
     assert response.headers["content-length"] == str(len(b"cached-audio"))
     assert api_env.gateway.calls == []
@@ -237,7 +235,7 @@ async def test_cache_miss_calls_gateway_stores_audio_and_returns_wav(api_env: Ap
     )
 
     assert response.status_code == 200
-    assert response.body == b"wav-audio"
+    assert response.content == b"wav-audio"
     assert response.headers["content-type"] == "audio/wav"
     assert response.headers["content-length"] == str(len(b"wav-audio"))
     assert len(api_env.gateway.calls) == 1
@@ -1,5 +1,5 @@
 import pytest
-from cachevoice.cache.store import FuzzyCacheStorage
+from cachevoice.cache.store import FuzzyCacheStorage, converted_path
 from cachevoice.cache.metadata import CacheMetadataDB
 from cachevoice.cache.evictor import CacheEvictor
 from cachevoice.cache.normalizer import normalize
@@ -75,6 +75,39 @@ def test_eviction_syncs_hot_cache(tmp_path):
     assert store.lookup(text, voice) is None
 
 
+@pytest.mark.anyio
+async def test_eviction_run_async_syncs_hot_cache(tmp_path):
+    store = FuzzyCacheStorage(str(tmp_path / "audio"))
+    db = CacheMetadataDB(str(tmp_path / "cache.db"))
+    audio_path = store.store("merhaba", "v", b"fake_audio_data")
+    db.add_entry("merhaba", "merhaba", "v", audio_path)
+    rendition = Path(converted_path(audio_path, "opus"))
+    rendition.parent.mkdir()
+    rendition.write_bytes(b"opus")
+
+    evictor = CacheEvictor(db, max_entries=0, hot_cache=store.hot_cache)
+    assert await evictor.run_async() == 1
+
+    assert not Path(audio_path).exists()
+    assert not rendition.exists()
+    assert store.lookup("merhaba", "v") is None
+    assert db.get_all_entries() == []
+
+
+def test_eviction_tolerates_missing_audio_files(tmp_path):
+    db = CacheMetadataDB(str(tmp_path / "cache.db"))
+    present = tmp_path / "present.mp3"
+    present.write_bytes(b"audio")
+    for i, path in enumerate([str(tmp_path / "missing.mp3"), str(present)]):
+        db.add_entry(
+            text_original=f"t{i}", text_normalized=f"t{i}", voice_id="v1",
+            audio_path=path, model="tts-1", audio_format="mp3", file_size=5,
+        )
+
+    assert CacheEvictor(db, max_entries=0).run() == 2
+    assert not present.exists()
+
+
 def test_fuzzy_disabled_by_default(tmp_path):
     store = FuzzyCacheStorage(str(tmp_path / "audio"))
     store.store("merhaba dünya", "v1", b"audio")
@@ -149,3 +182,186 @@ def test_voice_bucketing_size():
     hc.add("b", "v1", "/2.mp3")
     hc.add("a", "v2", "/3.mp3")
     assert hc.size == 3
+
+
+def test_fuzzy_token_sort_uses_presorted_candidates():
+    hc = HotCache()
+    hc.add("dunya merhaba guzel", "v1", "/v1/a.mp3")
+    hc.add("tamamen baska", "v1", "/v1/b.mp3")
+
+    result = hc.fuzzy_lookup("merhaba dunya guzel", "v1", threshold=90)
+    assert result == ("dunya merhaba guzel", "/v1/a.mp3", 100.0)
+
+    hc.remove("dunya merhaba guzel", "v1")
+    assert hc.fuzzy_lookup("merhaba dunya guzel", "v1", threshold=90) is None
+
+
+def test_fuzzy_length_prefilter_keeps_reachable_candidates():
+    hc = HotCache()
+    hc.add("merhaba dunya guzel", "v1", "/v1/a.mp3")
+    hc.add("merhaba", "v1", "/v1/b.mp3")
+
+    # 19 chars vs 7 chars can never reach 90, so only the long entry is scored.
+    result = hc.fuzzy_lookup("merhaba dunya guzell", "v1", threshold=90)
+    assert result is not None
+    assert result[0] == "merhaba dunya guzel"
+    assert hc.fuzzy_lookup("merhaba dunya", "v1", threshold=90) is None
+
+
+def test_find_many_matches_single_find(tmp_path):
+    cfg = FuzzyConfig(enabled=True, threshold=60)
+    store = FuzzyCacheStorage(str(tmp_path / "audio"), fuzzy_config=cfg)
+    store.store("merhaba dünya", "v1", b"audio")
+    store.store("bakıyorum", "v1", b"audio")
+    texts = ["merhaba dunya guzel", "Bakıyorum", "tamamen farklı bir cümle", ""]
+
+    batched = store.matcher.find_many(texts, "v1")
+    assert store.lookup_many(texts, "v1") == batched
+
+    assert batched == [store.matcher.find(t, "v1") for t in texts]
+    assert batched[0] is not None and batched[0]["match_type"] == "fuzzy"
+    assert batched[1] is not None and batched[1]["match_type"] == "exact"
+    assert batched[2] is None
+    assert batched[3] is None
+
+
+@pytest.mark.anyio
+async def test_find_async_scores_fuzzy_off_loop(tmp_path):
+    cfg = FuzzyConfig(enabled=True, threshold=60)
+    store = FuzzyCacheStorage(str(tmp_path / "audio"), fuzzy_config=cfg)
+    store.store("merhaba dünya", "v1", b"audio")
+
+    result = await store.lookup_async("merhaba dunya guzel", "v1")
+    assert result == store.lookup("merhaba dunya guzel", "v1")
+    assert result is not None and result["match_type"] == "fuzzy"
+    assert await store.lookup_async("merhaba dünya", "v2") is None
+
+
+def test_fuzzy_choices_snapshot_rebuilt_on_change():
+    hc = HotCache()
+    hc.add("hello", "v1", "/a.mp3")
+    first = hc.fuzzy_choices("v1")
+    assert hc.fuzzy_choices("v1") is first
+
+    hc.add("hello world", "v1", "/b.mp3")
+    second = hc.fuzzy_choices("v1")
+    assert second is not first
+    assert sorted(second.keys) == ["hello", "hello world"]
+    assert first.keys == ["hello"]
+
+
+def test_fuzzy_choices_snapshot_does_not_share_path_dicts():
+    hc = HotCache(variety_depth=3)
+    hc.add("hello", "v1", "/a.mp3")
+    snapshot = hc.fuzzy_choices("v1")
+
+    # A new version of an existing key grows the cache's path dict in place;
+    # a worker thread scoring the snapshot must not see that dict at all
+    hc.add("hello", "v1", "/a2.mp3")
+    assert snapshot.paths == ["/a.mp3"]
+    assert all(isinstance(p, str) for p in snapshot.paths)
+    assert hc.get_paths("hello", "v1") == ["/a.mp3", "/a2.mp3"]
+
+
+def test_load_entries_deduplicates_paths_in_order():
+    hc = HotCache(variety_depth=4)
+    hc.load_entries([
+        {"voice_id": "v1", "text_normalized": "hello", "audio_path": "/a.mp3"},
+        {"voice_id": "v1", "text_normalized": "hello", "audio_path": "/b.mp3"},
+        {"voice_id": "v1", "text_normalized": "hello", "audio_path": "/a.mp3"},
+    ])
+    assert hc.get_paths("hello", "v1") == ["/a.mp3", "/b.mp3"]
+
+
+def test_fuzzy_lookup_reuses_snapshot_between_calls():
+    hc = HotCache()
+    hc.add("merhaba dunya guzel", "v1", "/v1/a.mp3")
+    hc.add("merhaba", "v1", "/v1/b.mp3")
+    hc.add("tamamen baska bir cumle", "v1", "/v1/c.mp3")
+
+    assert hc.fuzzy_lookup("merhaba dunya guzell", "v1", threshold=90)[0] == "merhaba dunya guzel"
+    snapshot = hc.fuzzy_choices("v1")
+    assert snapshot.lengths == sorted(snapshot.lengths)
+    assert hc.fuzzy_lookup("merhabaa", "v1", threshold=90)[0] == "merhaba"
+    assert hc.fuzzy_lookup("merhaba", "v1", threshold=60, scorer="ratio")[0] == "merhaba"
+    assert hc.fuzzy_choices("v1") is snapshot
+
+
+def test_fuzzy_short_circuits_when_threshold_unreachable(tmp_path, monkeypatch):
+    cfg = FuzzyConfig(enabled=True, threshold=100, scorer="ratio")
+    store = FuzzyCacheStorage(str(tmp_path / "audio"), fuzzy_config=cfg)
+    store.store("merhaba dunya", "v1", b"audio")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("fuzzy path should be skipped")
+
+    monkeypatch.setattr(store.matcher._hot, "fuzzy_lookup", fail)
+    assert store.lookup("merhaba dunyaa", "v1") is None
+    assert store.lookup("merhaba dunya", "v1")["match_type"] == "exact"
+
+
+def test_fuzzy_threshold_100_keeps_token_sort_reorders(tmp_path):
+    cfg = FuzzyConfig(enabled=True, threshold=100)
+    store = FuzzyCacheStorage(str(tmp_path / "audio"), fuzzy_config=cfg)
+    store.store("merhaba dunya", "v1", b"audio")
+
+    result = store.lookup("dunya merhaba", "v1")
+    assert result is not None and result["match_type"] == "fuzzy"
+
+
+def test_find_normalized_skips_renormalization(tmp_path):
+    store = FuzzyCacheStorage(str(tmp_path / "audio"))
+    store.store("Bakıyorum", "v1", b"audio")
+
+    normalized = normalize("Bakıyorum")
+    assert store.matcher.find_normalized(normalized, "v1") == store.matcher.find("Bakıyorum", "v1")
+    assert store.matcher.find_normalized("", "v1") is None
+
+
+@pytest.mark.anyio
+async def test_store_async_matches_store(tmp_path):
+    db = CacheMetadataDB(str(tmp_path / "cache.db"))
+    store = FuzzyCacheStorage(str(tmp_path / "audio"), metadata_db=db, variety_depth=2)
+
+    path = await store.store_async("Merhaba dünya", "v1", b"audio-1")
+    assert Path(path).read_bytes() == b"audio-1"
+    assert store.lookup("Merhaba dünya", "v1")["audio_path"] == path
+    assert db.get_version_count("merhaba dunya", "v1") == 1
+
+    second = await store.store_async("Merhaba dünya", "v1", b"audio-2")
+    assert second != path
+    assert db.get_version_count("merhaba dunya", "v1") == 2
+
+
+def test_store_replaces_files_atomically(tmp_path):
+    store = FuzzyCacheStorage(str(tmp_path / "audio"))
+    path = store.store("hello", "v1", b"first-audio")
+
+    with open(path, "rb") as reader:
+        # The same key rewrites the same file name; a reader already streaming
+        # the old file keeps its complete contents
+        assert store.store("hello", "v1", b"second") == path
+        assert reader.read() == b"first-audio"
+
+    assert Path(path).read_bytes() == b"second"
+    assert [p.name for p in (tmp_path / "audio").iterdir()] == [Path(path).name]
+
+
+@pytest.mark.anyio
+async def test_store_async_looks_up_versions_off_the_event_loop(tmp_path, monkeypatch):
+    import threading
+    db = CacheMetadataDB(str(tmp_path / "cache.db"))
+    store = FuzzyCacheStorage(str(tmp_path / "audio"), metadata_db=db, variety_depth=2)
+    loop_thread = threading.get_ident()
+    lookup_threads: list[int] = []
+    get_version_count = db.get_version_count
+
+    def tracking_get_version_count(*args):
+        lookup_threads.append(threading.get_ident())
+        return get_version_count(*args)
+
+    monkeypatch.setattr(db, "get_version_count", tracking_get_version_count)
+
+    await store.store_async("Merhaba dünya", "v1", b"audio-1")
+
+    assert lookup_threads and loop_thread not in lookup_threads
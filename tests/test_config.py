@@ -0,0 +1,43 @@
+"""Tests for loading Settings from YAML."""
+
+from cachevoice.config import Settings
+
+
+def test_from_yaml_substitutes_env_placeholders(tmp_path, monkeypatch):
+    monkeypatch.setenv("CV_TEST_KEY", "secret-123")
+    monkeypatch.setenv("CV_TEST_HOST", "tts.example")
+    monkeypatch.setenv("CV_TEST_FALLBACK", "edge")
+    monkeypatch.delenv("CV_TEST_MISSING", raising=False)
+    config_path = tmp_path / "cachevoice.yaml"
+    config_path.write_text(
+        """
+cache:
+  audio_dir: {audio_dir}
+  variety_depth: 2
+providers:
+  default: minimax
+  fallback_chain: ["${{CV_TEST_FALLBACK}}"]
+  minimax:
+    litellm_model: minimax/speech-01-turbo
+    api_key: ${{CV_TEST_KEY}}
+    base_url: https://${{CV_TEST_HOST}}/v1
+  edge:
+    api_key: ${{CV_TEST_MISSING}}
+    default_voice: tr-TR-AhmetNeural
+""".format(audio_dir=tmp_path / "audio")
+    )
+
+    settings = Settings.from_yaml(str(config_path))
+
+    assert settings.cache.audio_dir == str(tmp_path / "audio")
+    assert settings.cache.variety_depth == 2
+    minimax = settings.get_provider("minimax")
+    assert minimax.api_key == "secret-123"
+    assert minimax.base_url == "https://tts.example/v1"
+    # Unset variables are left as the placeholder, which resolves to no key
+    edge = settings.get_provider("edge")
+    assert edge.api_key == "${CV_TEST_MISSING}"
+    assert edge.resolved_api_key is None
+    assert edge.default_voice == "tr-TR-AhmetNeural"
+    # Placeholders inside lists are substituted too
+    assert settings.providers.fallback_chain == ["edge"]
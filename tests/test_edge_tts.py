@@ -48,3 +48,23 @@ async def test_edge_tts_property():
     """Test default_voice property."""
     provider = EdgeTTSProvider(default_voice="tr-TR-AhmetNeural")
     assert provider.default_voice == "tr-TR-AhmetNeural"
+
+
+@pytest.mark.anyio
+async def test_edge_tts_collects_audio_chunks_in_memory(monkeypatch):
+    """Only audio chunks from the stream end up in the returned bytes."""
+    import edge_tts
+
+    class _FakeCommunicate:
+        def __init__(self, text, voice):
+            self.voice = voice
+
+        async def stream(self):
+            yield {"type": "audio", "data": b"ID3"}
+            yield {"type": "WordBoundary", "offset": 0}
+            yield {"type": "audio", "data": b"-rest"}
+
+    monkeypatch.setattr(edge_tts, "Communicate", _FakeCommunicate)
+    provider = EdgeTTSProvider()
+
+    assert await provider.synthesize("merhaba") == b"ID3-rest"
@@ -98,6 +98,10 @@ async def test_all_providers_down_returns_503():
         _ = await orchestrator.synthesize("hello", "alloy")
 
     assert exc_info.value.status_code == 503
+    assert exc_info.value.detail == (
+        "TTS unavailable: all fallback providers failed"
+        " (litellm: litellm timeout; edge_tts: edge unavailable)"
+    )
 
 
 @pytest.mark.anyio
@@ -151,6 +155,41 @@ async def test_circuit_breaker_opens_after_3_failures_within_window():
     assert edge.calls == 4
 
 
+@pytest.mark.anyio
+async def test_circuit_breaker_window_slides_past_old_failures():
+    error_500 = _http_status_error(500, "server error")
+    lite = StubLiteLLMRouter([error_500] * 4)
+    edge = StubEdgeProvider(b"edge-audio")
+    clock = {"now": 0.0}
+    orchestrator = FallbackOrchestrator(
+        ["litellm", "edge_tts"], lite, edge,
+        failure_threshold=3, failure_window_seconds=300, now_fn=lambda: clock["now"],
+    )
+
+    for t in (0.0, 290.0, 310.0):
+        clock["now"] = t
+        await orchestrator.synthesize("t", "v")
+    # The failure at t=0 has left the window, so only two count so far
+    assert lite.calls == 3
+
+    clock["now"] = 320.0
+    await orchestrator.synthesize("t", "v")
+    clock["now"] = 321.0
+    await orchestrator.synthesize("t", "v")
+    assert lite.calls == 4
+
+
+@pytest.mark.anyio
+async def test_provider_names_dispatch_case_insensitively_and_unknown_falls_back():
+    lite = StubLiteLLMRouter([b"lite-audio"])
+    edge = StubEdgeProvider(b"edge-audio")
+    orchestrator = FallbackOrchestrator(["mystery", "Edge_TTS"], lite, edge)
+
+    assert await orchestrator.synthesize("t", "v") == b"edge-audio"
+    assert edge.calls == 1
+    assert lite.calls == 0
+
+
 @pytest.mark.anyio
 async def test_available_property():
     lite = StubLiteLLMRouter([])
@@ -1,5 +1,6 @@
 """Test that fuzzy cache hits increment the MATCHED entry's hit_count, not the input's."""
 import pytest
+import sqlite3
 from cachevoice.cache.store import FuzzyCacheStorage
 from cachevoice.cache.metadata import CacheMetadataDB
 
@@ -42,7 +43,8 @@ def test_fuzzy_hit_increments_matched_entry(store_and_db):
     assert len(entries) == 1
     
     # Get hit_count for the matched entry
-    conn = db._get_conn()
+    conn = sqlite3.connect(db._db_path)
+    conn.row_factory = sqlite3.Row
     row = conn.execute(
         "SELECT hit_count FROM cache_entries WHERE text_normalized = ? AND voice_id = ?",
         (normalized_original, voice_id)
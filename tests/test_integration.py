@@ -1,8 +1,11 @@
 """Integration tests — full cache flow."""
 import pytest
+import logging
 import os
+import time
 import asyncio
-import json
+import anyio
+import httpx
 from pathlib import Path
 from typing import cast
 from fastapi.testclient import TestClient
@@ -15,7 +18,7 @@ from cachevoice.cache.evictor import CacheEvictor
 from cachevoice.cache.normalizer import normalize
 from cachevoice.config import Settings
 from cachevoice.gateway.fallback import FallbackOrchestrator
-from cachevoice.fillers.manager import FillerManager
+from cachevoice.fillers.manager import FILLER_TEMPLATES, FillerManager
 
 
 @pytest.fixture
@@ -89,16 +92,13 @@ def test_integrity_removes_orphan_db_entries(integrity_env):
 
     real_file = Path(audio_dir) / "real.mp3"
     real_file.write_bytes(b"audio-data")
-    db.add_entry(
-        text_original="real", text_normalized="real", voice_id="v1",
-        audio_path=str(real_file), audio_format="mp3", file_size=10,
-    )
-
-    db.add_entry(
-        text_original="ghost", text_normalized="ghost", voice_id="v1",
-        audio_path=str(Path(audio_dir) / "nonexistent.mp3"), audio_format="mp3",
-        file_size=10,
-    )
+    db.add_entries_bulk([
+        {"text_original": "real", "text_normalized": "real", "voice_id": "v1",
+         "audio_path": str(real_file), "audio_format": "mp3", "file_size": 10},
+        {"text_original": "ghost", "text_normalized": "ghost", "voice_id": "v1",
+         "audio_path": str(Path(audio_dir) / "nonexistent.mp3"), "audio_format": "mp3",
+         "file_size": 10},
+    ])
 
     store.hot_cache.load_entries(db.get_all_entries())
     assert store.hot_cache.size == 2
@@ -133,6 +133,58 @@ def test_integrity_removes_orphan_audio_files(integrity_env):
     assert len(db.get_all_entries()) == 1
 
 
+def test_integrity_removes_interrupted_write_temp_files(integrity_env):
+    db, store, audio_dir, _tmp_path = integrity_env
+    leftover = Path(audio_dir) / "abc.mp3.k2j4x9.tmp"
+    leftover.write_bytes(b"partial")
+
+    _startup_integrity_check(db, store, audio_dir)
+
+    assert not leftover.exists()
+
+
+def test_integrity_matches_relative_and_external_paths(integrity_env, monkeypatch):
+    db, store, audio_dir, tmp_path = integrity_env
+    monkeypatch.chdir(tmp_path)
+
+    # Relative DB path into the audio dir, plus a file kept outside it
+    (tmp_path / "audio" / "rel.mp3").write_bytes(b"audio-data")
+    external = tmp_path / "external.mp3"
+    external.write_bytes(b"audio-data")
+    db.add_entries_bulk([
+        {"text_original": name, "text_normalized": name, "voice_id": "v1",
+         "audio_path": path, "audio_format": "mp3", "file_size": 10}
+        for name, path in (("rel", "audio/rel.mp3"), ("ext", str(external)), ("gone", str(tmp_path / "gone.mp3")))
+    ])
+
+    _startup_integrity_check(db, store, "audio")
+
+    assert sorted(str(e["text_normalized"]) for e in db.get_all_entries()) == ["ext", "rel"]
+    assert (tmp_path / "audio" / "rel.mp3").exists()
+    assert external.exists()
+
+
+@pytest.mark.anyio
+async def test_background_integrity_check_spares_files_written_meanwhile(integrity_env):
+    db, store, audio_dir, tmp_path = integrity_env
+    db.add_entry(
+        text_original="ghost", text_normalized="ghost", voice_id="v1",
+        audio_path=str(Path(audio_dir) / "ghost.mp3"), audio_format="mp3", file_size=10,
+    )
+    store.hot_cache.load_entries(db.get_all_entries())
+    # Not yet in the DB, but written after the check started (e.g. a miss in flight)
+    fresh = Path(audio_dir) / "fresh.mp3"
+    fresh.write_bytes(b"audio-data")
+    future = time.time() + 60
+    os.utime(fresh, (future, future))
+
+    await server._background_integrity_check(db, store, audio_dir)
+
+    assert db.get_all_entries() == []
+    assert store.hot_cache.exact_lookup("ghost", "v1") is None
+    assert fresh.exists()
+
+
 def test_integrity_preserves_filler_dir(integrity_env):
     db, store, audio_dir, tmp_path = integrity_env
 
@@ -145,19 +197,13 @@ def test_integrity_preserves_filler_dir(integrity_env):
     assert filler_file.exists()
 
 
-def test_auto_generate_fillers_on_startup(tmp_path, monkeypatch, capfd):
-    import yaml
-    from cachevoice.config import Settings
-    
-    config_path = tmp_path / "test_config.yaml"
+def test_auto_generate_fillers_on_startup(tmp_path, monkeypatch, caplog):
     audio_dir = tmp_path / "audio"
-    db_path = tmp_path / "test.db"
     audio_dir.mkdir()
-    
-    config_data = {
+    settings = Settings.model_validate({
         "cache": {
             "audio_dir": str(audio_dir),
-            "db_path": str(db_path),
+            "db_path": str(tmp_path / "test.db"),
         },
         "fillers": {
             "auto_generate_on_startup": True,
@@ -169,34 +215,29 @@ def test_auto_generate_fillers_on_startup(tmp_path, monkeypatch, capfd):
                 "default_voice": "tr-TR-AhmetNeural",
             },
         },
-    }
+    })
+    monkeypatch.setattr("cachevoice.server._load_settings", lambda: settings)
     
-    with open(config_path, "w") as f:
-        yaml.dump(config_data, f)
+    # The "cachevoice" logger doesn't propagate, so hand caplog's handler to it directly
+    app_logger = logging.getLogger("cachevoice")
+    app_logger.addHandler(caplog.handler)
+    try:
+        with TestClient(app):
+            pass
+    finally:
+        app_logger.removeHandler(caplog.handler)
     
-    monkeypatch.setattr("cachevoice.server._load_settings", lambda: Settings.from_yaml(str(config_path)))
-    
-    with TestClient(app) as client:
-        pass
-    
-    captured = capfd.readouterr()
-    assert "Auto-generating fillers for voice 'TestVoice'" in captured.err
-    assert "Fillers: generated" in captured.err
+    assert "Auto-generating fillers for voice 'TestVoice'..." in caplog.messages
+    assert any(m.startswith("Fillers: generated") for m in caplog.messages)
 
 
 def test_auto_generate_disabled_by_default(tmp_path, monkeypatch):
-    import yaml
-    from cachevoice.config import Settings
-    
-    config_path = tmp_path / "test_config.yaml"
     audio_dir = tmp_path / "audio"
-    db_path = tmp_path / "test.db"
     audio_dir.mkdir()
-    
-    config_data = {
+    settings = Settings.model_validate({
         "cache": {
             "audio_dir": str(audio_dir),
-            "db_path": str(db_path),
+            "db_path": str(tmp_path / "test.db"),
         },
         "fillers": {
             "auto_generate_on_startup": False,
@@ -207,12 +248,8 @@ def test_auto_generate_disabled_by_default(tmp_path, monkeypatch):
                 "default_voice": "tr-TR-AhmetNeural",
             },
         },
-    }
-    
-    with open(config_path, "w") as f:
-        yaml.dump(config_data, f)
-    
-    monkeypatch.setattr("cachevoice.server._load_settings", lambda: Settings.from_yaml(str(config_path)))
+    })
+    monkeypatch.setattr("cachevoice.server._load_settings", lambda: settings)
     
     with TestClient(app) as client:
         resp = client.get("/v1/cache/fillers?voice_id=Decent_Boy")
@@ -281,7 +318,8 @@ def _make_settings(tmp_path: Path, variety_depth: int) -> Settings:
         {
             "cache": {
                 "audio_dir": str(tmp_path / "audio"),
-                "db_path": str(tmp_path / "cache.db"),
+                # Each test opens its own CacheMetadataDB and never reopens it by path
+                "db_path": ":memory:",
                 "enabled": True,
                 "variety_depth": variety_depth,
             },
@@ -309,67 +347,34 @@ def _setup_variety_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, variety_
     monkeypatch.setattr(server, "_store", store)
     monkeypatch.setattr(server, "_db", db)
     monkeypatch.setattr(server, "_gateway", gateway)
-    monkeypatch.setattr(server, "_variety_in_flight", set())
+    monkeypatch.setattr(server, "_variety_in_flight", {})
     monkeypatch.setattr(server, "_evictor", None)
     monkeypatch.setattr(server, "_write_counter", 0)
 
     return settings, store, db, gateway
 
 
-async def _call_audio_speech(payload: dict[str, str]):
-    body = json.dumps(payload).encode()
+async def _post_json(path: str, payload: dict[str, str]) -> httpx.Response:
+    # Through the real ASGI stack, without running the app lifespan
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(path, json=payload)
 
-    async def receive() -> dict[str, object]:
-        return {"type": "http.request", "body": body, "more_body": False}
 
-    request = Request(
-        {
-            "type": "http",
-            "http_version": "1.1",
-            "method": "POST",
-            "scheme": "http",
-            "path": "/v1/audio/speech",
-            "raw_path": b"/v1/audio/speech",
-            "query_string": b"",
-            "headers": [(b"content-type", b"application/json")],
-            "client": ("testclient", 50000),
-            "server": ("testserver", 80),
-        },
-        receive=receive,  # type: ignore[arg-type]
-    )
-    return await server.audio_speech(request)
+async def _call_audio_speech(payload: dict[str, str]):
+    return await _post_json("/v1/audio/speech", payload)
 
 
 async def _call_generate_fillers(payload: dict[str, str]):
-    body = json.dumps(payload).encode()
-
-    async def receive() -> dict[str, object]:
-        return {"type": "http.request", "body": body, "more_body": False}
-
-    request = Request(
-        {
-            "type": "http",
-            "http_version": "1.1",
-            "method": "POST",
-            "scheme": "http",
-            "path": "/v1/cache/fillers/generate",
-            "raw_path": b"/v1/cache/fillers/generate",
-            "query_string": b"",
-            "headers": [(b"content-type", b"application/json")],
-            "client": ("testclient", 50000),
-            "server": ("testserver", 80),
-        },
-        receive=receive,  # type: ignore[arg-type]
-    )
-    return await server.generate_fillers(request)
+    return (await _post_json("/v1/cache/fillers/generate", payload)).json()
 
 
 async def _wait_for_version_count(db: CacheMetadataDB, normalized_text: str, voice: str, expected: int):
-    for _ in range(100):
-        if db.get_version_count(normalized_text, voice) == expected:
-            return
-        await asyncio.sleep(0.01)
-    raise AssertionError(f"Expected version_count={expected} for {normalized_text}/{voice}")
+    task = server._variety_in_flight.get((normalized_text, voice))
+    if task is not None:
+        await task
+    count = db.get_version_count(normalized_text, voice)
+    assert count == expected, f"Expected version_count={expected} for {normalized_text}/{voice}, got {count}"
 
 
 @pytest.mark.anyio
@@ -383,7 +388,7 @@ async def test_variety_background_generation_on_cache_miss(monkeypatch: pytest.M
 
     await _wait_for_version_count(db, normalized, payload["voice"], expected=2)
     assert len(gateway.calls) == 2
-    assert server._variety_in_flight == set()
+    assert server._variety_in_flight == {}
 
 
 @pytest.mark.anyio
@@ -401,7 +406,7 @@ async def test_variety_background_generation_on_cache_hit(monkeypatch: pytest.Mo
     await _wait_for_version_count(db, normalized, payload["voice"], expected=3)
 
     assert len(gateway.calls) == 3
-    assert server._variety_in_flight == set()
+    assert server._variety_in_flight == {}
 
 
 @pytest.mark.anyio
@@ -416,7 +421,7 @@ async def test_variety_no_background_when_depth_reached(monkeypatch: pytest.Monk
 
     second = await _call_audio_speech(payload)
     assert second.status_code == 200
-    await asyncio.sleep(0.05)
+    assert server._variety_in_flight == {}
 
     assert db.get_version_count(normalized, payload["voice"]) == 2
     assert len(gateway.calls) == 2
@@ -424,7 +429,7 @@ async def test_variety_no_background_when_depth_reached(monkeypatch: pytest.Monk
 
 @pytest.mark.anyio
 async def test_variety_in_flight_deduplicates_background_generation(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    _, store, db, gateway = _setup_variety_env(monkeypatch, tmp_path, variety_depth=2, delay_seconds=0.05)
+    _, store, db, gateway = _setup_variety_env(monkeypatch, tmp_path, variety_depth=2, delay_seconds=0.01)
     text = "dedup me"
     voice = "Decent_Boy"
     normalized = normalize(text)
@@ -448,7 +453,7 @@ async def test_variety_in_flight_deduplicates_background_generation(monkeypatch:
     await _wait_for_version_count(db, normalized, voice, expected=2)
 
     assert len(gateway.calls) == 1
-    assert server._variety_in_flight == set()
+    assert server._variety_in_flight == {}
 
 
 @pytest.mark.anyio
@@ -459,13 +464,13 @@ async def test_end_to_end_cache_flow_store_hit_evict_miss_restore(monkeypatch: p
 
     first = await _call_audio_speech(payload)
     assert first.status_code == 200
-    assert first.body == b"audio-1"
+    assert first.content == b"audio-1"
     assert len(gateway.calls) == 1
     assert db.get_version_count(normalized, payload["voice"]) == 1
 
     second = await _call_audio_speech(payload)
     assert second.status_code == 200
-    assert second.body == b"audio-1"
+    assert second.content == b"audio-1"
     assert len(gateway.calls) == 1
 
     evictor = CacheEvictor(db, max_entries=0, hot_cache=store.hot_cache)
@@ -474,7 +479,7 @@ async def test_end_to_end_cache_flow_store_hit_evict_miss_restore(monkeypatch: p
 
     third = await _call_audio_speech(payload)
     assert third.status_code == 200
-    assert third.body == b"audio-2"
+    assert third.content == b"audio-2"
     assert len(gateway.calls) == 2
     assert db.get_version_count(normalized, payload["voice"]) == 1
 
@@ -496,7 +501,7 @@ async def test_variety_depth_random_selection_uses_existing_versions(monkeypatch
     monkeypatch.setattr("cachevoice.cache.hot.random.choice", lambda paths: paths[-1])
     third = await _call_audio_speech(payload)
     assert third.status_code == 200
-    assert third.body == b"audio-3"
+    assert third.content == b"audio-3"
     assert len(gateway.calls) == 3
     assert len(store.hot_cache.get_paths(normalized, payload["voice"])) == 3
 
@@ -524,7 +529,7 @@ async def test_minimax_marked_and_plain_text_share_cache_key(monkeypatch: pytest
 
     second = await _call_audio_speech(second_payload)
     assert second.status_code == 200
-    assert second.body == first.body
+    assert second.content == first.content
     assert len(gateway.calls) == 1
     assert db.get_version_count(normalized, second_payload["voice"]) == 1
 
@@ -555,7 +560,7 @@ async def test_provider_fallback_integration_uses_edge_on_primary_failure(monkey
     monkeypatch.setattr(server, "_store", store)
     monkeypatch.setattr(server, "_db", db)
     monkeypatch.setattr(server, "_gateway", gateway)
-    monkeypatch.setattr(server, "_variety_in_flight", set())
+    monkeypatch.setattr(server, "_variety_in_flight", {})
     monkeypatch.setattr(server, "_evictor", None)
     monkeypatch.setattr(server, "_write_counter", 0)
 
@@ -563,7 +568,7 @@ async def test_provider_fallback_integration_uses_edge_on_primary_failure(monkey
     response = await _call_audio_speech(payload)
 
     assert response.status_code == 200
-    assert response.body == b"edge-fallback-audio"
+    assert response.content == b"edge-fallback-audio"
     assert lite.calls == 1
     assert edge.calls == 1
     assert db.get_version_count(normalize(payload["input"]), payload["voice"]) == 1
@@ -573,7 +578,7 @@ async def test_provider_fallback_integration_uses_edge_on_primary_failure(monkey
 async def test_format_conversion_mp3_to_opus_cached_and_served(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
     _, store, _, gateway = _setup_variety_env(monkeypatch, tmp_path, variety_depth=1)
 
-    def fake_convert(audio_data: bytes, target_format: str) -> bytes | None:
+    async def fake_convert(audio_data: bytes, target_format: str) -> bytes | None:
         if target_format == "opus":
             return b"converted-opus"
         return None
@@ -583,8 +588,8 @@ async def test_format_conversion_mp3_to_opus_cached_and_served(monkeypatch: pyte
 
     first = await _call_audio_speech(payload)
     assert first.status_code == 200
-    assert first.body == b"converted-opus"
-    assert first.media_type == "audio/ogg"
+    assert first.content == b"converted-opus"
+    assert first.headers["content-type"] == "audio/ogg"
     assert gateway.calls[0]["response_format"] == "mp3"
 
     lookup = store.lookup(payload["input"], payload["voice"])
@@ -593,7 +598,7 @@ async def test_format_conversion_mp3_to_opus_cached_and_served(monkeypatch: pyte
 
     second = await _call_audio_speech(payload)
     assert second.status_code == 200
-    assert second.body == b"converted-opus"
+    assert second.content == b"converted-opus"
     assert len(gateway.calls) == 1
 
 
@@ -610,7 +615,7 @@ async def test_filler_generation_and_lookup_flow(monkeypatch: pytest.MonkeyPatch
     monkeypatch.setattr(server, "_db", db)
     monkeypatch.setattr(server, "_gateway", filler_gateway)
     monkeypatch.setattr(server, "_filler_mgr", filler_mgr)
-    monkeypatch.setattr(server, "_variety_in_flight", set())
+    monkeypatch.setattr(server, "_variety_in_flight", {})
     monkeypatch.setattr(server, "_evictor", None)
     monkeypatch.setattr(server, "_write_counter", 0)
 
@@ -628,29 +633,160 @@ async def test_filler_generation_and_lookup_flow(monkeypatch: pytest.MonkeyPatch
     assert store.lookup(str(first_filler["text"]), "Decent_Boy") is not None
 
 
+def test_list_fillers_reports_cached_templates(tmp_path: Path):
+    store = FuzzyCacheStorage(str(tmp_path / "audio"))
+    db = CacheMetadataDB(str(tmp_path / "cache.db"))
+    filler_mgr = FillerManager(db, store)
+    path = store.store("Bakıyorum", "Decent_Boy", b"audio")
+
+    listed = {item["id"]: item for item in filler_mgr.list_fillers("Decent_Boy")}
+
+    assert listed["ack_searching"]["cached"] is True
+    assert listed["ack_searching"]["audio_path"] == path
+    assert [item["cached"] for fid, item in listed.items() if fid != "ack_searching"] == [False] * 7
+
+
+class _ConcurrencyTrackingGateway(_FillerGatewayStub):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def synthesize(
+        self,
+        text: str,
+        voice: str | None = None,
+        model: str | None = None,
+        response_format: str = "mp3",
+    ) -> bytes:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await anyio.sleep(0.01)
+        self.in_flight -= 1
+        if text == "Bir dakika":
+            raise RuntimeError("provider down")
+        return await super().synthesize(text, voice, model, response_format)
+
+
+@pytest.mark.anyio
+async def test_generate_fillers_runs_concurrently_with_bound(tmp_path: Path):
+    store = FuzzyCacheStorage(str(tmp_path / "audio"))
+    db = CacheMetadataDB(str(tmp_path / "cache.db"))
+    gateway = _ConcurrencyTrackingGateway()
+    filler_mgr = FillerManager(db, store, gateway, max_concurrency=3)
+
+    results = await filler_mgr.generate_fillers("Decent_Boy")
+
+    assert [r["id"] for r in results] == [t["id"] for t in FILLER_TEMPLATES]
+    assert gateway.peak == 3
+    statuses = {r["id"]: r["status"] for r in results}
+    assert statuses.pop("ack_wait") == "error"
+    assert set(statuses.values()) == {"generated"}
+
+
+@pytest.mark.anyio
+async def test_cache_hit_conversion_is_memoized_per_file_version(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    _, store, db, gateway = _setup_variety_env(monkeypatch, tmp_path, variety_depth=1)
+    convert_calls: list[bytes] = []
+
+    async def fake_convert(audio_data: bytes, target_format: str) -> bytes | None:
+        convert_calls.append(audio_data)
+        return b"opus:" + audio_data
+
+    monkeypatch.setattr(server, "_convert_audio_format", fake_convert)
+    audio_path = Path(store.store("memo opus", "Decent_Boy", b"mp3-v1"))
+    db.add_entry("memo opus", normalize("memo opus"), "Decent_Boy", str(audio_path), file_size=6)
+    payload = {"input": "memo opus", "voice": "Decent_Boy", "model": "tts-1", "response_format": "opus"}
+
+    first = await _call_audio_speech(payload)
+    second = await _call_audio_speech(payload)
+    assert first.content == second.content == b"opus:mp3-v1"
+    assert convert_calls == [b"mp3-v1"]
+
+    # The rendition kept on disk survives the in-memory memo (e.g. a restart)
+    rendition = Path(server.converted_path(str(audio_path), "opus"))
+    assert rendition.read_bytes() == b"opus:mp3-v1"
+    server._clear_converted_cache()
+    assert (await _call_audio_speech(payload)).content == b"opus:mp3-v1"
+    assert convert_calls == [b"mp3-v1"]
+
+    # A rewritten cache file changes the key, so stale conversions are not served
+    audio_path.write_bytes(b"mp3-version-2")
+    third = await _call_audio_speech(payload)
+    assert third.content == b"opus:mp3-version-2"
+    assert len(convert_calls) == 2
+    assert gateway.calls == []
+
+
+@pytest.mark.anyio
+async def test_cache_hit_empty_conversion_serves_cached_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    _, store, db, gateway = _setup_variety_env(monkeypatch, tmp_path, variety_depth=1)
+
+    async def empty_convert(audio_data: bytes, target_format: str) -> bytes | None:
+        return b""
+
+    monkeypatch.setattr(server, "_convert_audio_format", empty_convert)
+    audio_path = store.store("empty wav", "Decent_Boy", b"mp3-data")
+    db.add_entry("empty wav", normalize("empty wav"), "Decent_Boy", audio_path, file_size=8)
+
+    response = await _call_audio_speech(
+        {"input": "empty wav", "voice": "Decent_Boy", "model": "tts-1", "response_format": "wav"}
+    )
+    assert response.status_code == 200
+    assert response.content == b"mp3-data"
+    assert response.headers["content-type"] == "audio/mpeg"
+    assert gateway.calls == []
+
+
+def test_integrity_removes_orphan_converted_renditions(integrity_env):
+    db, store, audio_dir, _tmp_path = integrity_env
+    audio_dir_path = Path(audio_dir)
+    kept_source = audio_dir_path / "kept.mp3"
+    kept_source.write_bytes(b"kept")
+    db.add_entry("kept", "kept", "v1", str(kept_source))
+
+    converted_dir = audio_dir_path / "converted"
+    converted_dir.mkdir()
+    kept = converted_dir / "kept.mp3.opus"
+    kept.write_bytes(b"opus")
+    orphan = converted_dir / "gone.mp3.opus"
+    orphan.write_bytes(b"opus")
+    partial = converted_dir / "kept.mp3.wav.tmp"
+    partial.write_bytes(b"wav")
+
+    _startup_integrity_check(db, store, audio_dir)
+
+    assert kept.exists()
+    assert not orphan.exists()
+    assert not partial.exists()
+
+
+def test_write_rendition_uses_a_unique_temp_file(tmp_path: Path):
+    rendition = tmp_path / "converted" / "a.mp3.wav"
+    rendition.parent.mkdir()
+    # Another conversion's in-progress temp file under the old fixed name
+    other = rendition.parent / "a.mp3.wav.tmp"
+    other.write_bytes(b"other-writer")
+
+    server._write_rendition(str(rendition), b"wav-data")
+
+    assert rendition.read_bytes() == b"wav-data"
+    assert other.read_bytes() == b"other-writer"
+    assert sorted(p.name for p in rendition.parent.iterdir()) == ["a.mp3.wav", "a.mp3.wav.tmp"]
+
+
 def test_integrity_cleans_mixed_orphans_and_preserves_non_audio(integrity_env):
     db, store, audio_dir, _tmp_path = integrity_env
     audio_dir_path = Path(audio_dir)
 
     real_file = audio_dir_path / "real.mp3"
     real_file.write_bytes(b"real")
-    db.add_entry(
-        text_original="real",
-        text_normalized="real",
-        voice_id="v1",
-        audio_path=str(real_file),
-        audio_format="mp3",
-        file_size=4,
-    )
-
-    db.add_entry(
-        text_original="ghost",
-        text_normalized="ghost",
-        voice_id="v1",
-        audio_path=str(audio_dir_path / "ghost.mp3"),
-        audio_format="mp3",
-        file_size=4,
-    )
+    db.add_entries_bulk([
+        {"text_original": "real", "text_normalized": "real", "voice_id": "v1",
+         "audio_path": str(real_file), "audio_format": "mp3", "file_size": 4},
+        {"text_original": "ghost", "text_normalized": "ghost", "voice_id": "v1",
+         "audio_path": str(audio_dir_path / "ghost.mp3"), "audio_format": "mp3", "file_size": 4},
+    ])
 
     orphan_audio = audio_dir_path / "orphan.ogg"
     orphan_audio.write_bytes(b"orphan")
@@ -670,3 +806,171 @@ def test_integrity_cleans_mixed_orphans_and_preserves_non_audio(integrity_env):
     assert not orphan_audio.exists()
     assert non_audio.exists()
     assert filler_file.exists()
+
+
+@pytest.mark.anyio
+async def test_convert_audio_format_pipes_through_ffmpeg(monkeypatch: pytest.MonkeyPatch):
+    import subprocess
+
+    calls: list[tuple[list[str], dict[str, object]]] = []
+
+    async def fake_run_process(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess[bytes]:
+        calls.append((cmd, kwargs))
+        if cmd[-1] != "pipe:1":
+            Path(cmd[-1]).write_bytes(b"RIFF-wav")
+            return subprocess.CompletedProcess(cmd, 0, stdout=None)
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"OggS-opus")
+
+    monkeypatch.setattr(server.anyio, "run_process", fake_run_process)
+
+    assert await server._convert_audio_format(b"mp3-bytes", "opus") == b"OggS-opus"
+    cmd, kwargs = calls[-1]
+    assert cmd[cmd.index("-i") + 1] == "pipe:0"
+    assert cmd[cmd.index("-threads") + 1] == "1"
+    assert cmd.index("-i") < cmd.index("-threads")
+    assert kwargs["input"] == b"mp3-bytes"
+
+    assert await server._convert_audio_format(b"mp3-bytes", "wav") == b"RIFF-wav"
+    wav_output = calls[-1][0][-1]
+    assert not Path(wav_output).exists()
+
+    assert await server._convert_audio_format(b"mp3-bytes", "flac") is None
+
+
+def _ogg_page(packet: bytes) -> bytes:
+    # Capture pattern, version, header type, granule, serial, seq, crc, one segment
+    return b"OggS" + bytes(22) + bytes([1, len(packet)]) + packet
+
+
+@pytest.mark.anyio
+async def test_convert_audio_format_stream_copies_matching_ogg_codec(monkeypatch: pytest.MonkeyPatch):
+    import subprocess
+
+    calls: list[list[str]] = []
+
+    async def fake_run_process(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess[bytes]:
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"OggS-out")
+
+    monkeypatch.setattr(server.anyio, "run_process", fake_run_process)
+    opus = _ogg_page(b"OpusHead" + bytes(11))
+    vorbis = _ogg_page(b"\x01vorbis" + bytes(23))
+    assert server._ogg_codec(opus) == "opus"
+    assert server._ogg_codec(vorbis) == "vorbis"
+    assert server._ogg_codec(b"ID3") is None
+
+    await server._convert_audio_format(opus, "opus")
+    assert calls[-1][-5:] == ["-c", "copy", "-f", "ogg", "pipe:1"]
+    await server._convert_audio_format(vorbis, "ogg")
+    assert "copy" in calls[-1]
+    # Different codec still re-encodes
+    await server._convert_audio_format(opus, "ogg")
+    assert "libvorbis" in calls[-1]
+
+
+@pytest.mark.anyio
+async def test_convert_audio_format_times_out(monkeypatch: pytest.MonkeyPatch):
+    async def hung_run_process(cmd: list[str], **kwargs: object) -> None:
+        await anyio.sleep_forever()
+
+    monkeypatch.setattr(server.anyio, "run_process", hung_run_process)
+    monkeypatch.setattr(server, "FFMPEG_TIMEOUT_SECONDS", 0.01)
+
+    assert await server._convert_audio_format(b"mp3-bytes", "opus") is None
+
+
+def test_input_demuxer_from_magic_bytes():
+    assert server._input_demuxer(b"ID3\x04rest") == ["-f", "mp3"]
+    assert server._input_demuxer(b"\xff\xfb\x90\x00") == ["-f", "mp3"]
+    assert server._input_demuxer(b"OggS\x00\x02") == ["-f", "ogg"]
+    assert server._input_demuxer(b"RIFF\x24\x00\x00\x00WAVEfmt ") == ["-f", "wav"]
+    assert server._input_demuxer(b"mp3-bytes") == []
+    # Same sync word, but not MPEG Layer III: ADTS AAC and a reserved version
+    assert server._input_demuxer(b"\xff\xf1\x50\x80") == []
+    assert server._input_demuxer(b"\xff\xf9\x50\x80") == []
+    assert server._input_demuxer(b"\xff\xeb\x90\x00") == []
+
+
+def test_filler_etag_memoized_until_file_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(server, "_etag_cache", {})
+    audio = tmp_path / "hmm.mp3"
+    audio.write_bytes(b"first")
+
+    etag = server._filler_etag(audio, audio.stat())
+    assert server._filler_etag(audio, audio.stat()) == etag
+    assert server._etag_cache[audio][2] == etag
+
+    audio.write_bytes(b"second version")
+    assert server._filler_etag(audio, audio.stat()) != etag
+
+
+@pytest.mark.anyio
+async def test_filler_audio_served_as_file_with_etag(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    settings = _make_settings(tmp_path, 1)
+    monkeypatch.setattr(server, "_settings", settings)
+    fillers_dir = Path(settings.cache.audio_dir) / "fillers"
+    fillers_dir.mkdir(parents=True)
+    (fillers_dir / "hmm.mp3").write_bytes(b"filler-audio")
+
+    def make_request(headers: list[tuple[bytes, bytes]]) -> Request:
+        return Request({
+            "type": "http", "method": "GET", "path": "/v1/fillers/hmm",
+            "query_string": b"", "headers": headers,
+        })
+
+    response = await server.get_filler_audio("hmm", make_request([]))
+    assert isinstance(response, server.FileResponse)
+    assert response.headers["cache-control"] == "public, max-age=86400"
+    etag = response.headers["etag"]
+
+    cached = await server.get_filler_audio("hmm", make_request([(b"if-none-match", etag.encode())]))
+    assert cached.status_code == 304
+
+
+@pytest.mark.anyio
+async def test_filler_listing_refreshes_when_directory_changes(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    settings = _make_settings(tmp_path, 1)
+    monkeypatch.setattr(server, "_settings", settings)
+    monkeypatch.setattr(server, "_filler_list_cache", None)
+    fillers_dir = Path(settings.cache.audio_dir) / "fillers"
+
+    assert await server.get_fillers() == {"fillers": []}
+
+    fillers_dir.mkdir(parents=True)
+    (fillers_dir / "hmm.mp3").write_bytes(b"a")
+    (fillers_dir / "notes.txt").write_bytes(b"b")
+    assert await server.get_fillers() == {"fillers": ["hmm"]}
+    assert await server.get_fillers() == {"fillers": ["hmm"]}
+
+    (fillers_dir / "ahh.ogg").write_bytes(b"c")
+    os.utime(fillers_dir, ns=(0, fillers_dir.stat().st_mtime_ns + 1))
+    assert await server.get_fillers() == {"fillers": ["ahh", "hmm"]}
+
+
+def test_write_trigger_wakes_periodic_eviction(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    class _CountingEvictor:
+        def __init__(self):
+            self.runs = 0
+
+        async def run_async(self) -> int:
+            self.runs += 1
+            return 0
+
+    async def scenario() -> int:
+        evictor = _CountingEvictor()
+        trigger = asyncio.Event()
+        monkeypatch.setattr(server, "_settings", _make_settings(tmp_path, 1))
+        monkeypatch.setattr(server, "_evictor", evictor)
+        monkeypatch.setattr(server, "_eviction_trigger", trigger)
+        task = asyncio.create_task(server._periodic_eviction())
+        await asyncio.sleep(0)
+        assert evictor.runs == 0
+        trigger.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return evictor.runs
+
+    assert asyncio.run(scenario()) == 1
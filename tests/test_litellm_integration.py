@@ -3,19 +3,18 @@ from __future__ import annotations
 from collections.abc import Generator
 from dataclasses import dataclass
 from io import BytesIO
-import json
 from pathlib import Path
 from typing import cast
 import wave
 
+import anyio
+import httpx
 import pytest
-from starlette.requests import Request
-from starlette.responses import Response
 
 import cachevoice.server as server
 from cachevoice.cache.metadata import CacheMetadataDB
 from cachevoice.cache.store import FuzzyCacheStorage
-from cachevoice.config import Settings
+from cachevoice.config import Settings, resolve_api_key
 from cachevoice.gateway.litellm_router import LiteLLMRouter
 
 
@@ -81,28 +80,15 @@ def _make_settings(tmp_path: Path) -> Settings:
     )
 
 
-async def _call_audio_speech(payload: dict[str, str]) -> Response:
-    body = json.dumps(payload).encode()
+async def _post_json(path: str, payload: dict[str, str]) -> httpx.Response:
+    # Through the real ASGI stack, without running the app lifespan
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(path, json=payload)
 
-    async def receive() -> dict[str, object]:
-        return {"type": "http.request", "body": body, "more_body": False}
 
-    request = Request(
-        {
-            "type": "http",
-            "http_version": "1.1",
-            "method": "POST",
-            "scheme": "http",
-            "path": "/v1/audio/speech",
-            "raw_path": b"/v1/audio/speech",
-            "query_string": b"",
-            "headers": [(b"content-type", b"application/json")],
-            "client": ("testclient", 50000),
-            "server": ("testserver", 80),
-        },
-        receive=receive,  # type: ignore[arg-type]
-    )
-    return await server.audio_speech(request)
+async def _call_audio_speech(payload: dict[str, str]) -> httpx.Response:
+    return await _post_json("/v1/audio/speech", payload)
 
 
 def _valid_wav_bytes() -> bytes:
@@ -150,9 +136,23 @@ def litellm_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Generator[Li
 
 def test_router_initialization_from_config(litellm_env: LiteLLMEnv):
     assert litellm_env.gateway.available is True
-    model_names = {cast(str, entry["model_name"]) for entry in litellm_env.router_stub.model_list}
-    assert "minimax" in model_names
-    assert "minimax:tts-1" in model_names
+    model_names = [cast(str, entry["model_name"]) for entry in litellm_env.router_stub.model_list]
+    # tts-1 maps to the provider's default model, so it reuses that deployment
+    assert model_names == ["minimax"]
+    assert litellm_env.gateway._route_index[("minimax", "tts-1")] == "minimax"
+
+
+def test_router_keeps_separate_deployment_for_distinct_model(litellm_env: LiteLLMEnv):
+    settings = litellm_env.settings.model_copy(
+        update={"model_mapping": {"minimax": {"tts-1": "speech-01-turbo", "tts-1-hd": "speech-01-hd"}}}
+    )
+    gateway = LiteLLMRouter(settings)
+
+    stub = cast(RouterStub, gateway._router)
+    model_names = [cast(str, entry["model_name"]) for entry in stub.model_list]
+    assert model_names == ["minimax", "minimax:tts-1-hd"]
+    assert gateway._route_index[("minimax", "tts-1")] == "minimax"
+    assert gateway._route_index[("minimax", "tts-1-hd")] == "minimax:tts-1-hd"
 
 
 @pytest.mark.anyio
@@ -164,7 +164,7 @@ async def test_cache_miss_goes_request_to_litellm_to_audio_to_cache(litellm_env:
     )
 
     assert response.status_code == 200
-    assert response.body == b"generated-audio"
+    assert response.content == b"generated-audio"
     assert response.headers["content-type"] == "audio/mpeg"
     assert len(litellm_env.router_stub.calls) == 1
     assert litellm_env.store.size == 1
@@ -181,8 +181,10 @@ async def test_cache_hit_returns_same_audio_without_provider_call(litellm_env: L
 
     assert first.status_code == 200
     assert second.status_code == 200
-    assert first.body == b"stable-audio"
-    assert second.body == b"stable-audio"
+    assert first.content == b"stable-audio"
+    assert second.content == b"stable-audio"
+    # Streamed from disk by FileResponse, which sets an ETag
+    assert "etag" in second.headers
     assert len(litellm_env.router_stub.calls) == 1
 
 
@@ -199,7 +201,7 @@ async def test_voice_mapping_alloy_to_decent_boy_applied(litellm_env: LiteLLMEnv
 async def test_format_conversion_returns_valid_audio(litellm_env: LiteLLMEnv, monkeypatch: pytest.MonkeyPatch):
     expected_wav = _valid_wav_bytes()
 
-    def fake_convert(audio_data: bytes, target_format: str) -> bytes | None:
+    async def fake_convert(audio_data: bytes, target_format: str) -> bytes | None:
         _ = audio_data
         if target_format == "wav":
             return expected_wav
@@ -214,9 +216,8 @@ async def test_format_conversion_returns_valid_audio(litellm_env: LiteLLMEnv, mo
     assert response.status_code == 200
     assert len(litellm_env.router_stub.calls) == 1
     assert response.headers["content-type"] == "audio/wav"
-    body = bytes(response.body)
-    assert body.startswith(b"RIFF")
-    assert body[8:12] == b"WAVE"
+    assert response.content.startswith(b"RIFF")
+    assert response.content[8:12] == b"WAVE"
 
 
 @pytest.mark.anyio
@@ -232,26 +233,195 @@ async def test_max_text_length_enforcement_skips_cache_store(litellm_env: LiteLL
     assert len(litellm_env.db.get_all_entries()) == 0
 
 
-def test_has_api_key_empty_string_returns_false():
-    from cachevoice.gateway.litellm_router import LiteLLMRouter
-    assert LiteLLMRouter._has_api_key("") is False
+class _BlockingRouter(RouterStub):
+    def __init__(self, model_list: list[dict[str, object]]):
+        super().__init__(model_list)
+        self.release = anyio.Event()
+        self.error: Exception | None = None
+
+    async def aspeech(self, model: str, input: str, voice: str, response_format: str) -> bytes:
+        self.calls.append({"model": model, "input": input, "voice": voice, "response_format": response_format})
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.response_bytes
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_synthesize_shares_one_upstream_call(litellm_env: LiteLLMEnv):
+    stub = _BlockingRouter(litellm_env.router_stub.model_list)
+    litellm_env.gateway._router = stub  # type: ignore[assignment]
+    results: list[bytes] = []
+
+    async def call() -> None:
+        results.append(await litellm_env.gateway.synthesize("burst", "alloy", "tts-1"))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(call)
+        await anyio.wait_all_tasks_blocked()
+        stub.release.set()
+
+    assert results == [b"stub-mp3-audio"] * 3
+    assert len(stub.calls) == 1
+    assert litellm_env.gateway._inflight == {}
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_synthesize_shares_upstream_error(litellm_env: LiteLLMEnv):
+    stub = _BlockingRouter(litellm_env.router_stub.model_list)
+    stub.error = RuntimeError("upstream down")
+    litellm_env.gateway._router = stub  # type: ignore[assignment]
+    errors: list[str] = []
+
+    async def call() -> None:
+        try:
+            await litellm_env.gateway.synthesize("burst", "alloy", "tts-1")
+        except RuntimeError as exc:
+            errors.append(str(exc))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(2):
+            tg.start_soon(call)
+        await anyio.wait_all_tasks_blocked()
+        stub.release.set()
+
+    assert errors == ["upstream down"] * 2
+    assert len(stub.calls) == 1
+    assert litellm_env.gateway._inflight == {}
+
+
+@pytest.mark.anyio
+async def test_cancelled_first_caller_hands_synthesis_to_waiter(litellm_env: LiteLLMEnv):
+    stub = _BlockingRouter(litellm_env.router_stub.model_list)
+    litellm_env.gateway._router = stub  # type: ignore[assignment]
+    results: list[bytes] = []
+
+    async def waiter() -> None:
+        results.append(await litellm_env.gateway.synthesize("burst", "alloy", "tts-1"))
+
+    async with anyio.create_task_group() as tg:
+        async with anyio.create_task_group() as first:
+            first.start_soon(litellm_env.gateway.synthesize, "burst", "alloy", "tts-1")
+            await anyio.wait_all_tasks_blocked()
+            tg.start_soon(waiter)
+            await anyio.wait_all_tasks_blocked()
+            # e.g. the first client disconnects
+            first.cancel_scope.cancel()
+        await anyio.wait_all_tasks_blocked()
+        stub.release.set()
+
+    assert results == [b"stub-mp3-audio"]
+    assert len(stub.calls) == 2
+    assert litellm_env.gateway._inflight == {}
+
+
+def test_resolve_api_key_empty_string_returns_none():
+    assert resolve_api_key("") is None
+
+
+def test_resolve_api_key_whitespace_only_returns_none():
+    assert resolve_api_key("   ") is None
+
+
+def test_resolve_api_key_real_key_returned_unchanged():
+    assert resolve_api_key("real-key-123") == "real-key-123"
+
 
+def test_resolve_api_key_unresolved_env_var_returns_none():
+    assert resolve_api_key("${MISSING_VAR}") is None
 
-def test_has_api_key_whitespace_only_returns_false():
-    from cachevoice.gateway.litellm_router import LiteLLMRouter
-    assert LiteLLMRouter._has_api_key("   ") is False
 
+def test_resolve_api_key_none_returns_none():
+    assert resolve_api_key(None) is None
 
-def test_has_api_key_real_key_returns_true():
-    from cachevoice.gateway.litellm_router import LiteLLMRouter
-    assert LiteLLMRouter._has_api_key("real-key-123") is True
 
+def test_voice_mapping_accepts_both_layouts(litellm_env: LiteLLMEnv):
+    settings = litellm_env.settings.model_copy(
+        update={
+            "voice_mapping": {
+                "minimax": {"alloy": "Decent_Boy", "echo": "Deep_Voice_Man"},
+                "echo": {"minimax": "Calm_Woman"},
+            }
+        }
+    )
+    gateway = LiteLLMRouter(settings)
+
+    assert gateway._map_voice("alloy", "minimax") == "Decent_Boy"
+    assert gateway._map_voice("echo", "minimax") == "Calm_Woman"
+    assert gateway._map_voice("nova", "minimax") == "nova"
+
+
+@pytest.mark.anyio
+async def test_synthesize_routes_known_and_unknown_models(litellm_env: LiteLLMEnv):
+    settings = litellm_env.settings.model_copy(
+        update={"model_mapping": {"minimax": {"tts-1": "speech-01-turbo", "tts-1-hd": "speech-01-hd"}}}
+    )
+    gateway = LiteLLMRouter(settings)
+    stub = cast(RouterStub, gateway._router)
+
+    await gateway.synthesize("routed", None, "tts-1-hd")
+    await gateway.synthesize("routed", None, "unlisted-model")
+
+    assert [c["model"] for c in stub.calls] == ["minimax:tts-1-hd", "minimax"]
+    assert all(c["voice"] == "Decent_Boy" for c in stub.calls)
+
+
+class _FlakyRouter(RouterStub):
+    def __init__(self, model_list: list[dict[str, object]]):
+        super().__init__(model_list)
+        self.failing: set[str] = set()
+
+    async def aspeech(self, model: str, input: str, voice: str, response_format: str) -> bytes:
+        audio = await super().aspeech(model, input, voice, response_format)
+        if model.split(":", maxsplit=1)[0] in self.failing:
+            raise TimeoutError(f"{model} timed out")
+        return audio
 
-def test_has_api_key_unresolved_env_var_returns_false():
-    from cachevoice.gateway.litellm_router import LiteLLMRouter
-    assert LiteLLMRouter._has_api_key("${MISSING_VAR}") is False
 
+@pytest.mark.anyio
+async def test_failed_provider_skipped_until_cooldown_expires(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr("cachevoice.gateway.litellm_router.provider_list", ["minimax", "openai"])
+    monkeypatch.setattr("cachevoice.gateway.litellm_router.Router", _FlakyRouter)
+    settings = Settings.model_validate(
+        {
+            "providers": {
+                "default": "minimax",
+                "fallback_chain": ["openai"],
+                "minimax": {"litellm_model": "minimax/speech-01-turbo", "api_key": "k"},
+                "openai": {"litellm_model": "openai/tts-1", "api_key": "k"},
+            },
+            "cache": {"audio_dir": str(tmp_path / "audio"), "db_path": str(tmp_path / "cache.db")},
+        }
+    )
+    clock = [0.0]
+    gateway = LiteLLMRouter(settings, cooldown_seconds=30.0, now_fn=lambda: clock[0])
+    stub = cast(_FlakyRouter, gateway._router)
+    stub.failing = {"minimax"}
+
+    await gateway.synthesize("one", "alloy", "tts-1")
+    await gateway.synthesize("two", "alloy", "tts-1")
+    assert [c["input"] for c in stub.calls if c["model"].startswith("minimax")] == ["one"]
+
+    clock[0] = 31.0
+    stub.failing = set()
+    await gateway.synthesize("three", "alloy", "tts-1")
+    assert stub.calls[-1]["model"].startswith("minimax")
+    assert gateway._cooldown_until == {}
+
+
+def test_unresolved_api_key_placeholder_not_forwarded(litellm_env: LiteLLMEnv, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("cachevoice.gateway.litellm_router.provider_list", ["edge"])
+    settings = Settings.model_validate(
+        {
+            "providers": {
+                "default": "edge",
+                "edge": {"litellm_model": "edge/tr-TR-AhmetNeural", "api_key": "${EDGE_KEY}"},
+            },
+        }
+    )
+    gateway = LiteLLMRouter(settings)
 
-def test_has_api_key_none_returns_false():
-    from cachevoice.gateway.litellm_router import LiteLLMRouter
-    assert LiteLLMRouter._has_api_key(None) is False
+    stub = cast(RouterStub, gateway._router)
+    params = cast(dict[str, object], stub.model_list[0]["litellm_params"])
+    assert "api_key" not in params
@@ -126,3 +126,19 @@ def test_multiple_providers():
     assert model_mapper.map("tts-1", "minimax") == "speech-01-turbo"
     assert model_mapper.map("tts-1", "elevenlabs") == "eleven_multilingual_v2"
     assert model_mapper.map("tts-1", "openai") == "tts-1"
+
+
+def test_mapper_ignores_malformed_entries():
+    """Test non-dict provider maps and non-string names are skipped."""
+    config = {
+        "voice_mapping": {
+            "alloy": "Decent_Boy",
+            "echo": {"minimax": 42, "openai": "echo-v2"},
+        }
+    }
+    mapper = VoiceMapper(config)
+
+    assert mapper.map("alloy", "minimax") == "alloy"
+    assert mapper.map("echo", "minimax") == "echo"
+    assert mapper.map("echo", "openai") == "echo-v2"
+    assert mapper.table == {("echo", "openai"): "echo-v2"}
@@ -5,7 +5,13 @@ from cachevoice.cache.metadata import CacheMetadataDB, CURRENT_SCHEMA_VERSION
 
 
 @pytest.fixture
-def db(tmp_path):
+def db():
+    return CacheMetadataDB(":memory:")
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    # On-disk DB, for tests that open a second connection to the same file
     return CacheMetadataDB(str(tmp_path / "test.db"))
 
 
@@ -73,11 +79,11 @@ def test_get_version_count(db):
     assert db.get_version_count("hello", "voice1") == 3
 
 
-def test_record_hit_specific_version(db):
-    db.add_entry("test", "test", "v", "/tmp/a.mp3", version_num=1)
-    db.add_entry("test", "test", "v", "/tmp/b.mp3", version_num=2)
-    db.record_hit("test", "v", version_num=1)
-    conn = sqlite3.connect(db._db_path)
+def test_record_hit_specific_version(file_db):
+    file_db.add_entry("test", "test", "v", "/tmp/a.mp3", version_num=1)
+    file_db.add_entry("test", "test", "v", "/tmp/b.mp3", version_num=2)
+    file_db.record_hit("test", "v", version_num=1)
+    conn = sqlite3.connect(file_db._db_path)
     conn.row_factory = sqlite3.Row
     r1 = conn.execute(
         "SELECT hit_count FROM cache_entries WHERE version_num = 1"
@@ -185,3 +191,171 @@ def test_concurrent_add_entry_same_key_creates_single_row(db):
 
     assert len(set(ids)) == 1
     assert db.get_version_count("parallel hello", "voice1") == 1
+
+
+def test_connection_persists_across_calls(db):
+    conn = db._conn
+    db.add_entry("a", "a", "v", "/tmp/1.mp3")
+    db.record_hit("a", "v")
+    assert db.get_stats()["total_hits"] == 1
+    assert db._conn is conn
+
+    db.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.get_all_entries()
+
+
+def test_reads_use_separate_query_only_connection(file_db):
+    assert file_db._read_conn is not file_db._conn
+    file_db.add_entry("a", "a", "v", "/tmp/1.mp3")
+    assert file_db.get_version_count("a", "v") == 1
+    with pytest.raises(sqlite3.OperationalError):
+        file_db._read_conn.execute("DELETE FROM cache_entries")
+    assert file_db._read_conn.execute("PRAGMA cache_size").fetchone()[0] < 0
+
+
+def test_connections_use_wal_with_normal_sync(file_db):
+    for conn in (file_db._conn, file_db._read_conn):
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA journal_size_limit").fetchone()[0] == 67108864
+
+
+def test_reads_proceed_while_writer_holds_transaction(file_db):
+    file_db.add_entry("a", "a", "v", "/tmp/1.mp3")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        with file_db._transaction() as conn:
+            conn.execute(
+                "UPDATE cache_entries SET hit_count = hit_count + 1 WHERE text_normalized = 'a'"
+            )
+            # Reads must not queue behind the writer's lock: results arrive
+            # while the transaction is still open, showing the committed state
+            reads = [pool.submit(file_db.get_version_count, "a", "v") for _ in range(200)]
+            reads += [pool.submit(file_db.get_all_entries) for _ in range(20)]
+            results = [f.result(timeout=5) for f in reads]
+            assert results[:200] == [1] * 200
+            assert file_db._read_conn.execute(
+                "SELECT hit_count FROM cache_entries"
+            ).fetchone()[0] == 0
+
+        hits = [pool.submit(file_db.record_hit, "a", "v") for _ in range(50)]
+        reads = [pool.submit(file_db.get_version_count, "a", "v") for _ in range(200)]
+        for f in hits + reads:
+            f.result(timeout=5)
+
+    assert file_db.get_stats()["total_hits"] == 51
+
+
+@pytest.mark.anyio
+async def test_record_hit_async_coalesces_until_flush(file_db):
+    file_db.add_entry("test", "test", "v", "/tmp/a.mp3")
+    for _ in range(3):
+        await file_db.record_hit_async("test", "v")
+
+    conn = sqlite3.connect(file_db._db_path)
+    conn.row_factory = sqlite3.Row
+    before = conn.execute("SELECT hit_count FROM cache_entries").fetchone()
+    assert before["hit_count"] == 0
+
+    assert file_db.flush_hits() == 1
+    after = conn.execute("SELECT hit_count FROM cache_entries").fetchone()
+    conn.close()
+    assert after["hit_count"] == 3
+    assert file_db.flush_hits() == 0
+
+
+@pytest.mark.anyio
+async def test_get_stats_includes_pending_hits(db):
+    db.add_entry("test", "test", "v", "/tmp/a.mp3", version_num=1)
+    await db.record_hit_async("test", "v", version_num=1)
+    assert db.get_stats()["total_hits"] == 1
+
+
+def test_add_entries_bulk_inserts_in_one_call(db):
+    db.add_entry("a", "a", "v", "/tmp/existing.mp3")
+    inserted = db.add_entries_bulk([
+        {"text_original": "a", "text_normalized": "a", "voice_id": "v", "audio_path": "/tmp/dup.mp3"},
+        {"text_original": "b", "text_normalized": "b", "voice_id": "v", "audio_path": "/tmp/b.mp3",
+         "file_size": 100, "is_filler": True},
+        {"text_original": "b", "text_normalized": "b", "voice_id": "v", "audio_path": "/tmp/b2.mp3",
+         "version_num": 2},
+    ])
+    assert inserted == 2
+    stats = db.get_stats()
+    assert stats["total_entries"] == 3
+    assert stats["filler_count"] == 1
+    assert db.add_entries_bulk([]) == 0
+
+
+def test_reopen_adds_missing_indexes(tmp_path):
+    db_path = str(tmp_path / "reopen.db")
+    CacheMetadataDB(db_path).close()
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP INDEX idx_evictable_created")
+    conn.commit()
+    conn.close()
+
+    db = CacheMetadataDB(db_path)
+    row = db._conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_evictable_created'"
+    ).fetchone()
+    assert row is not None
+
+
+def test_delete_entries_returns_paths_in_one_call(db, monkeypatch):
+    monkeypatch.setattr("cachevoice.cache.metadata.DELETE_BATCH_SIZE", 2)
+    ids = [db.add_entry(f"t{i}", f"t{i}", "v", f"/tmp/{i}.mp3") for i in range(5)]
+
+    paths = db.delete_entries(ids[:4] + [9999])
+    assert sorted(paths) == [f"/tmp/{i}.mp3" for i in range(4)]
+    assert db.get_stats()["total_entries"] == 1
+    assert db.delete_entries([]) == []
+
+
+def test_iter_all_entries_streams_in_batches(db):
+    for i in range(5):
+        db.add_entry(f"t{i}", f"t{i}", "v", f"/tmp/{i}.mp3")
+
+    it = db.iter_all_entries(batch_size=2)
+    first = next(it)
+    # The lock is not held between batches, so the DB stays usable mid-iteration
+    assert db.get_stats()["total_entries"] == 5
+    rest = list(it)
+    assert [first] + rest == db.get_all_entries()
+    assert len(rest) == 4
+
+
+def test_eviction_candidates_are_unique(db):
+    ids = [db.add_entry(f"t{i}", f"t{i}", "v", f"/tmp/{i}.mp3") for i in range(4)]
+    db._conn.execute(
+        "UPDATE cache_entries SET created_at = datetime('now', '-30 days') WHERE id IN (?, ?)",
+        (ids[0], ids[1]),
+    )
+
+    candidates = db.get_eviction_candidates(max_entries=0, min_age_days=7)
+    candidate_ids = [c["id"] for c in candidates]
+    assert sorted(candidate_ids) == sorted(ids)
+    assert len(candidate_ids) == len(set(candidate_ids))
+
+
+@pytest.mark.anyio
+async def test_add_entry_async_matches_add_entry(db):
+    entry_id = await db.add_entry_async(
+        "Merhaba", "merhaba", "v", "/tmp/m.mp3", audio_format="ogg", file_size=12, version_num=2,
+    )
+    assert entry_id == db.add_entry("Merhaba", "merhaba", "v", "/tmp/m.mp3", version_num=2)
+    assert db.get_version_count("merhaba", "v") == 1
+    assert db.get_all_entries()[0]["audio_path"] == "/tmp/m.mp3"
+
+
+def test_add_or_hit_entry_counts_duplicate_as_hit(db):
+    first_id, inserted = db.add_or_hit_entry("hello", "hello", "voice1", "/tmp/a.mp3")
+    assert inserted
+    second_id, inserted = db.add_or_hit_entry("hello", "hello", "voice1", "/tmp/b.mp3")
+    assert not inserted
+    assert second_id == first_id
+    assert db.get_stats()["total_hits"] == 1
+    assert db.get_all_entries()[0]["audio_path"] == "/tmp/a.mp3"
+    # A new version is a fresh insert
+    _, inserted = db.add_or_hit_entry("hello", "hello", "voice1", "/tmp/c.mp3", version_num=2)
+    assert inserted
@@ -68,6 +68,11 @@ def test_minimax_combined_with_other_transforms():
     assert result == normalize("merhaba 5 kisi geldi")
 
 
+def test_minimax_pause_inside_interjection_is_stripped_first():
+    # Removing the pause exposes the interjection tag, which is then stripped too
+    assert normalize("merhaba (la<#1.5#>ughs) dunya") == "merhaba dunya"
+
+
 def test_minimax_disabled():
     cfg = NormalizeConfig(strip_minimax=False)
     result = normalize("hello<#2.4#>world", cfg)
@@ -120,3 +125,35 @@ def test_config_all_disabled():
 def test_default_config_backward_compatible():
     cfg = NormalizeConfig()
     assert normalize("Merhaba Dünya!", cfg) == normalize("Merhaba Dünya!")
+
+
+def test_turkish_lower_matches_translate_then_lower():
+    from cachevoice.cache.normalizer import TURKISH_LOWER_MAP
+    samples = ["Merhaba DÜNYA, İstanbul'da ÇOK GÜZEL", "ISPARTA ığdır", "ΟΔΟΣ ΣΑΣ", "ÀÉÎ Ωmega ǅ", ""]
+    for text in samples:
+        assert turkish_lower(text) == text.translate(TURKISH_LOWER_MAP).lower()
+
+
+def test_lower_and_fold_matches_two_pass_pipeline():
+    from cachevoice.cache.normalizer import DIACRITIC_MAP, _lower_and_fold
+    samples = ["IŞIK ĞÜÇÖ İstanbul", "Çiçek ıslak", "ΟΔΟΣ Şeker", "Ñandú ÅNGSTRÖM"]
+    for text in samples:
+        assert _lower_and_fold(text) == turkish_lower(text).translate(DIACRITIC_MAP)
+
+
+def test_normalize_memoizes_per_config_flags():
+    from cachevoice.cache.normalizer import _normalize
+    _normalize.cache_clear()
+    assert normalize("Merhaba, Dünya!") == "merhaba dunya"
+    assert normalize("Merhaba, Dünya!") == "merhaba dunya"
+    assert _normalize.cache_info().hits == 1
+    # Same text under a different config must not reuse the default result
+    assert normalize("Merhaba, Dünya!", NormalizeConfig(lowercase=False)) == "Merhaba Dünya"
+
+
+def test_normalize_does_not_memoize_long_inputs():
+    from cachevoice.cache.normalizer import NORMALIZE_CACHE_MAX_TEXT_LENGTH, _normalize
+    _normalize.cache_clear()
+    long_text = "Merhaba " * (NORMALIZE_CACHE_MAX_TEXT_LENGTH // 8 + 1)
+    assert normalize(long_text) == normalize(long_text) == long_text.strip().lower()
+    assert _normalize.cache_info().currsize == 0